@@ -1,12 +1,14 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from django.contrib.auth import authenticate
 from .models import User, UserProfile
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'phone', 'department', 'is_active_user', 'created_at']
         read_only_fields = ['id', 'created_at']
+        stub_fields = ['id', 'username', 'first_name', 'last_name']
 
 class UserProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
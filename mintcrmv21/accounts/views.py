@@ -4,6 +4,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import login, logout
+from core.mixins import QueryPlanMixin
 from .models import User, UserProfile
 from .serializers import LoginSerializer, RegisterSerializer, UserSerializer, UserProfileSerializer
 
@@ -56,7 +57,7 @@ def profile_view(request):
         serializer = UserProfileSerializer(profile)
         return Response(serializer.data)
 
-class UserListView(generics.ListCreateAPIView):
+class UserListView(QueryPlanMixin, generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
@@ -66,7 +67,7 @@ class UserListView(generics.ListCreateAPIView):
             return User.objects.all()
         return User.objects.filter(id=self.request.user.id)
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from contacts.models import Contact
 
 class Case(models.Model):
@@ -29,6 +32,8 @@ class Case(models.Model):
         ('other', 'Other'),
     ]
     
+    SEARCH_FIELDS = [('case_number', 'A'), ('title', 'A'), ('description', 'B')]
+    
     case_number = models.CharField(max_length=50, unique=True)
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -45,9 +50,21 @@ class Case(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='created_cases')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='case_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='case_search_idx'),
+            models.Index(
+                fields=['status'], name='case_open_status_idx',
+                condition=models.Q(status__in=['open', 'in_progress', 'pending']),
+            ),
+            models.Index(fields=['assigned_lawyer', 'status'], name='case_lawyer_status_idx'),
+            models.Index(fields=['case_type', 'status'], name='case_type_status_idx'),
+            models.Index(fields=['updated_at'], name='case_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.case_number} - {self.title}"
@@ -58,10 +75,14 @@ class CaseNote(models.Model):
     is_billable = models.BooleanField(default=False)
     hours_spent = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so backfilled time entries keep their dates
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='casenote_created_idx'),
+        ]
     
     def __str__(self):
         return f"Note for {self.case} by {self.created_by}"
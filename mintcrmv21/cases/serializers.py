@@ -1,4 +1,6 @@
+from django.db.models.functions import Lower
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Case, CaseNote, CaseDocument
 from accounts.serializers import UserSerializer
 from contacts.serializers import ContactSerializer
@@ -6,7 +8,7 @@ import uuid
 from contacts.models import Contact
 from accounts.models import User
 
-class CaseNoteSerializer(serializers.ModelSerializer):
+class CaseNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -14,7 +16,7 @@ class CaseNoteSerializer(serializers.ModelSerializer):
         fields = ['id', 'note', 'is_billable', 'hours_spent', 'created_by', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class CaseDocumentSerializer(serializers.ModelSerializer):
+class CaseDocumentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -22,7 +24,7 @@ class CaseDocumentSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'document', 'description', 'uploaded_by', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
-class CaseSerializer(serializers.ModelSerializer):
+class CaseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     client = ContactSerializer(read_only=True)
     assigned_lawyer = UserSerializer(read_only=True)
     team_members = UserSerializer(many=True, read_only=True)
@@ -42,6 +44,7 @@ class CaseSerializer(serializers.ModelSerializer):
             'contact_email', 'assignee'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        stub_fields = ['id', 'case_number', 'title', 'status']
 
     def to_internal_value(self, data):
         # Auto-generate case_number if not provided
@@ -56,11 +59,14 @@ class CaseSerializer(serializers.ModelSerializer):
         assignee = validated_data.pop('assignee', None)
         # Set client by contact_email if provided
         if contact_email:
-            try:
-                contact = Contact.objects.get(email=contact_email)
-                validated_data['client'] = contact
-            except Contact.DoesNotExist:
+            # Emails are not unique; take the oldest contact until duplicates are merged
+            contact = (
+                Contact.objects.annotate(email_lower=Lower('email'))
+                .filter(email_lower=contact_email.lower()).order_by('id').first()
+            )
+            if contact is None:
                 raise serializers.ValidationError({'contact_email': 'Contact with this email does not exist.'})
+            validated_data['client'] = contact
         # Set assigned_lawyer by assignee if provided
         if assignee:
             try:
@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('', views.CaseListCreateView.as_view(), name='case-list'),
     path('<int:pk>/', views.CaseDetailView.as_view(), name='case-detail'),
+    path('bulk-update/', views.CaseBatchUpdateView.as_view(), name='case-bulk-update'),
+    path('bulk-delete/', views.CaseBatchDeleteView.as_view(), name='case-bulk-delete'),
+    path('export/', views.CaseExportView.as_view(), name='case-export'),
     path('<int:case_id>/notes/', views.add_case_note, name='add-case-note'),
     path('<int:case_id>/documents/', views.upload_case_document, name='upload-case-document'),
 ]
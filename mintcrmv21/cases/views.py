@@ -3,23 +3,46 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from core.filters import FullTextSearchFilter
+from core.batch import BatchDeleteMixin, BatchUpdateMixin
+from core.mixins import FacetMixin, QueryPlanMixin
+from core.notes import create_notes
+from core.views import ExportMixin
 from .models import Case, CaseNote, CaseDocument
 from .serializers import CaseSerializer, CaseNoteSerializer, CaseDocumentSerializer
 
-class CaseListCreateView(generics.ListCreateAPIView):
+class CaseListCreateView(FacetMixin, QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Case.objects.all()
     serializer_class = CaseSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['status', 'priority', 'case_type', 'assigned_lawyer']
+    facet_fields = ['status', 'priority', 'case_type']
     search_fields = ['case_number', 'title', 'description']
     ordering_fields = ['created_at', 'case_number', 'title', 'priority']
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class CaseDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CaseExportView(ExportMixin, CaseListCreateView):
+    export_filename = 'cases'
+    export_fields = [
+        'id', 'case_number', 'title', 'case_type', 'status', 'priority', 'client_id',
+        'client__email', 'assigned_lawyer__username', 'court', 'judge', 'opposing_counsel',
+        'statute_of_limitations', 'created_at', 'updated_at'
+    ]
+
+class CaseBatchUpdateView(BatchUpdateMixin, CaseListCreateView):
+    batch_fields = [
+        'title', 'description', 'status', 'priority', 'case_type', 'assigned_lawyer', 'court',
+        'judge', 'opposing_counsel', 'statute_of_limitations'
+    ]
+
+class CaseBatchDeleteView(BatchDeleteMixin, CaseListCreateView):
+    pass
+
+class CaseDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Case.objects.all()
     serializer_class = CaseSerializer
     permission_classes = [IsAuthenticated]
@@ -27,15 +50,7 @@ class CaseDetailView(generics.RetrieveUpdateDestroyAPIView):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_case_note(request, case_id):
-    try:
-        case = Case.objects.get(id=case_id)
-        serializer = CaseNoteSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(case=case, created_by=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    except Case.DoesNotExist:
-        return Response({'error': 'Case not found'}, status=status.HTTP_404_NOT_FOUND)
+    return create_notes(request, Case, case_id, CaseNoteSerializer, 'case')
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Contact, ContactNote
+from .models import Contact, ContactImportJob, ContactNote, DuplicateCandidate
 
 class ContactNoteInline(admin.TabularInline):
     model = ContactNote
@@ -19,3 +19,16 @@ class ContactNoteAdmin(admin.ModelAdmin):
     list_display = ['contact', 'created_by', 'created_at']
     list_filter = ['created_at']
     readonly_fields = ['created_at']
+
+@admin.register(ContactImportJob)
+class ContactImportJobAdmin(admin.ModelAdmin):
+    list_display = ['original_filename', 'status', 'created_count', 'duplicate_count', 'error_count', 'created_by', 'created_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    list_display = ['contact_a', 'contact_b', 'score', 'status', 'updated_at']
+    list_filter = ['status']
+    raw_id_fields = ['contact_a', 'contact_b']
+    readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_save, pre_save
+
+class ContactsConfig(AppConfig):
+    name = 'contacts'
+
+    def ready(self):
+        from core.signals import bulk_saved
+        from .models import Contact
+        from .signals import check_bulk_for_duplicates, check_for_duplicates, set_dedupe_keys
+
+        pre_save.connect(set_dedupe_keys, sender=Contact, dispatch_uid='contact_dedupe_keys')
+        post_save.connect(check_for_duplicates, sender=Contact, dispatch_uid='contact_dedupe_check')
+        bulk_saved.connect(check_bulk_for_duplicates, sender=Contact, dispatch_uid='contact_dedupe_bulk')
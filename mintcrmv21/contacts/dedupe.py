@@ -0,0 +1,320 @@
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+from difflib import SequenceMatcher
+from itertools import combinations
+from django.db import connection, transaction
+from core.search import is_postgres
+from .models import Contact, DuplicateCandidate
+
+MATCH_FIELDS = ['type', 'first_name', 'last_name', 'company', 'email', 'phone', 'mobile']
+MATCH_THRESHOLD = 0.8
+# Blocks this large are common surnames or shared numbers; comparing
+# inside them costs O(n^2) and finds little the other keys would miss
+MAX_BLOCK_SIZE = 200
+CHUNK_SIZE = 2000
+GMAIL_DOMAINS = {'gmail.com', 'googlemail.com'}
+FREE_EMAIL_DOMAINS = GMAIL_DOMAINS | {
+    'yahoo.com', 'hotmail.com', 'outlook.com', 'live.com', 'icloud.com', 'aol.com', 'proton.me', 'protonmail.com',
+}
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+Signature = namedtuple('Signature', ['id', 'email', 'domain', 'name', 'surname', 'phones', 'company'])
+
+def normalize_email(email):
+    """Lowercase, drop ``+tag`` suffixes, and ignore dots in Gmail local parts."""
+    email = (email or '').strip().lower()
+    local, at, domain = email.rpartition('@')
+    if not at:
+        return email
+    local = local.split('+', 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f'{local}@{domain}'
+
+def normalize_phone(phone):
+    """The last ten digits, ignoring formatting and country prefixes; '' for short numbers."""
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) >= 7 else ''
+
+def normalize_name(value):
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char)).lower()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', value).split())
+
+def soundex(name):
+    letters = [char for char in normalize_name(name) if char.isalpha()]
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+        # h and w do not separate letters with the same code
+        if char not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+def signature(contact):
+    """Normalized matching fields for a Contact or a ``values()`` row."""
+    get = contact.get if isinstance(contact, dict) else lambda name: getattr(contact, name)
+    email = normalize_email(get('email'))
+    company = normalize_name(get('company'))
+    if get('type') == 'organization':
+        name = surname = company
+    else:
+        name = normalize_name(f"{get('first_name')} {get('last_name')}")
+        surname = normalize_name(get('last_name')) or name
+    phones = frozenset(phone for phone in (normalize_phone(get('phone')), normalize_phone(get('mobile'))) if phone)
+    return Signature(get('id'), email, email.rpartition('@')[2], name, surname, phones, company)
+
+def blocking_keys(sig):
+    """
+    Keys a duplicate is likely to share: the normalized email, the email
+    domain plus phonetic surname, the phonetic surname plus first initial,
+    and the last seven digits of each phone number.
+    """
+    keys = set()
+    if sig.email:
+        keys.add(f'e:{sig.email}')
+    sound = soundex(sig.surname)
+    if sound:
+        if sig.domain and sig.domain not in FREE_EMAIL_DOMAINS:
+            keys.add(f'd:{sig.domain}:{sound}')
+        keys.add(f'n:{sound}:{sig.name[:1]}')
+    for phone in sig.phones:
+        keys.add(f'p:{phone[-7:]}')
+    return sorted(keys)
+
+def similarity(a, b, floor=0.0):
+    """difflib ratio of two strings, or 0 when the cheap upper bounds already fall below ``floor``."""
+    if not a or not b:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+        return 0.0
+    return matcher.ratio()
+
+def score(a, b):
+    """
+    Score a pair of signatures between 0 and 1, with the evidence behind it.
+    The same normalized email is enough on its own. A shared phone or
+    employer is weighed against the names, so a family sharing one landline
+    does not score as one person, and a name with no other evidence scores 0.
+    """
+    reasons = []
+    if a.email and a.email == b.email:
+        reasons.append('email')
+        name = similarity(a.name, b.name)
+        value = 0.8 + 0.2 * name
+    elif a.phones & b.phones:
+        reasons.append('phone')
+        name = similarity(a.name, b.name, floor=2 * MATCH_THRESHOLD - 1)
+        value = 0.5 + 0.5 * name
+    else:
+        same_org = (a.domain and a.domain == b.domain and a.domain not in FREE_EMAIL_DOMAINS) or \
+            (a.company and similarity(a.company, b.company, floor=0.9) >= 0.9)
+        if not same_org:
+            # Matching names alone are too common to be worth a review
+            return 0.0, reasons
+        reasons.append('company')
+        name = similarity(a.name, b.name, floor=MATCH_THRESHOLD)
+        value = name
+    if name >= 0.85:
+        reasons.insert(0, 'name')
+    return round(value, 4), reasons
+
+def compare(pairs):
+    """``[(a_id, b_id, score, reasons)]`` for signature pairs scoring above the threshold."""
+    matches = []
+    for a, b in pairs:
+        value, reasons = score(a, b)
+        if value >= MATCH_THRESHOLD:
+            low, high = sorted((a.id, b.id))
+            matches.append((low, high, value, reasons))
+    return matches
+
+def save_candidates(matches):
+    # Dismissed pairs keep their status; only the score is refreshed
+    DuplicateCandidate.objects.bulk_create(
+        [DuplicateCandidate(contact_a_id=a, contact_b_id=b, score=value, reasons=reasons) for a, b, value, reasons in matches],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['contact_a', 'contact_b'],
+        update_fields=['score', 'reasons', 'updated_at'],
+    )
+
+def refresh_keys(contacts):
+    """Recompute ``dedupe_keys`` in place; returns the contacts whose keys changed."""
+    changed = []
+    for contact in contacts:
+        keys = blocking_keys(signature(contact))
+        if keys != contact.dedupe_keys:
+            contact.dedupe_keys = keys
+            changed.append(contact)
+    return changed
+
+def block_sizes(keys):
+    """
+    ``{key: contacts carrying it}`` on PostgreSQL, counting each key only
+    up to MAX_BLOCK_SIZE + 1 so a huge block costs no more than a small one.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT key, (SELECT count(*) FROM (SELECT 1 FROM {Contact._meta.db_table} '
+            f'WHERE dedupe_keys ? key LIMIT %s) AS block) FROM unnest(%s::text[]) AS key',
+            [MAX_BLOCK_SIZE + 1, keys],
+        )
+        return dict(cursor.fetchall())
+
+def shared_blocks(keys):
+    """
+    Signatures of every contact carrying one of ``keys``, grouped by key.
+    Oversized keys are counted and dropped before any rows are fetched.
+    """
+    queryset = Contact.objects.values('id', 'dedupe_keys', *MATCH_FIELDS)
+    if is_postgres(queryset):
+        sizes = block_sizes(keys)
+        keys = [key for key in keys if sizes[key] <= MAX_BLOCK_SIZE]
+        rows = queryset.filter(dedupe_keys__has_any_keys=keys).iterator() if keys else []
+    else:
+        # has_any_keys only matches array elements on PostgreSQL; elsewhere
+        # scan the table and let pairs_in() drop the oversized blocks
+        rows = queryset.iterator(chunk_size=CHUNK_SIZE)
+    wanted = set(keys)
+    blocks = defaultdict(list)
+    for row in rows:
+        sig = None
+        for key in row['dedupe_keys']:
+            if key in wanted:
+                sig = sig or signature(row)
+                blocks[key].append(sig)
+    return blocks
+
+def find_duplicates_for(contact_ids):
+    """
+    Incremental pass for new or edited contacts: per chunk, one query sizes
+    the blocks the contacts fall in and one fetches the members of those
+    small enough to compare. Pairs are compared only within shared keys.
+    """
+    contact_ids = list(contact_ids)
+    matches = []
+    for start in range(0, len(contact_ids), CHUNK_SIZE):
+        contacts = list(Contact.objects.filter(pk__in=contact_ids[start:start + CHUNK_SIZE]).only('id', 'dedupe_keys', *MATCH_FIELDS))
+        keys = sorted({key for contact in contacts for key in contact.dedupe_keys})
+        if not keys:
+            continue
+        new_ids = {contact.pk for contact in contacts}
+        matches.extend(compare(pairs_in(shared_blocks(keys), only=new_ids)))
+    save_candidates(matches)
+    return len(matches)
+
+def find_all_duplicates():
+    """
+    Full batch pass: stream every contact once, refresh stale keys, group
+    signatures by blocking key and compare pairs within each block. Pending
+    pairs that no longer match are removed.
+    """
+    blocks = defaultdict(list)
+    stale = []
+    for row in Contact.objects.values('id', 'dedupe_keys', *MATCH_FIELDS).iterator(chunk_size=CHUNK_SIZE):
+        sig = signature(row)
+        keys = blocking_keys(sig)
+        if keys != row['dedupe_keys']:
+            stale.append(Contact(pk=row['id'], dedupe_keys=keys))
+        for key in keys:
+            blocks[key].append(sig)
+    Contact.objects.bulk_update(stale, ['dedupe_keys'], batch_size=1000)
+
+    matches = compare(pairs_in(blocks))
+    with transaction.atomic():
+        save_candidates(matches)
+        found = {(a, b) for a, b, value, reasons in matches}
+        gone = [
+            pk for pk, a, b in DuplicateCandidate.objects.filter(status='pending').values_list('id', 'contact_a_id', 'contact_b_id')
+            if (a, b) not in found
+        ]
+        DuplicateCandidate.objects.filter(pk__in=gone).delete()
+    return len(matches)
+
+def pairs_in(blocks, only=None):
+    """Yield each distinct pair sharing a block once, optionally only pairs touching ``only``."""
+    seen = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for a, b in combinations(members, 2):
+            if a.id == b.id:
+                continue
+            pair = (min(a.id, b.id), max(a.id, b.id))
+            if pair in seen or (only is not None and a.id not in only and b.id not in only):
+                continue
+            seen.add(pair)
+            yield a, b
+
+# Fields copied from a duplicate when the surviving contact has them blank
+FILL_FIELDS = [
+    'last_name', 'company', 'title', 'phone', 'mobile', 'address', 'city', 'state', 'zip_code', 'country',
+]
+
+def merge_contacts(primary, duplicates):
+    """
+    Fold ``duplicates`` into ``primary``: every relation pointing at a
+    duplicate is moved with one UPDATE per relation, blank fields on
+    ``primary`` are filled in, and the duplicates are deleted. Returns the
+    number of rows moved per relation.
+    """
+    duplicates = [contact for contact in duplicates if contact.pk != primary.pk]
+    ids = [contact.pk for contact in duplicates]
+    moved = {}
+    with transaction.atomic():
+        list(Contact.objects.select_for_update().filter(pk__in=[primary.pk, *ids]).order_by('pk').values_list('pk'))
+        for relation in Contact._meta.related_objects:
+            model = relation.related_model
+            if model is DuplicateCandidate:
+                continue
+            if relation.many_to_many:
+                count = merge_many_to_many(relation, primary, ids)
+            elif relation.one_to_one:
+                count = merge_one_to_one(relation, primary, ids)
+            else:
+                field = relation.field.name
+                count = model._base_manager.filter(**{f'{field}__in': ids}).update(**{field: primary})
+            if count:
+                moved[relation.get_accessor_name()] = count
+
+        for contact in duplicates:
+            for name in FILL_FIELDS:
+                if not getattr(primary, name) and getattr(contact, name):
+                    setattr(primary, name, getattr(contact, name))
+            if contact.notes and contact.notes not in primary.notes:
+                primary.notes = '\n\n'.join(filter(None, [primary.notes, contact.notes]))
+        primary.tag_names = [tag for contact in [primary, *duplicates] for tag in contact.tag_names]
+        primary.save()
+        Contact.objects.filter(pk__in=ids).delete()
+    return moved
+
+def merge_many_to_many(relation, primary, ids):
+    through = relation.through
+    source = relation.field.m2m_reverse_field_name()
+    target = relation.field.m2m_field_name()
+    # Drop links the primary already has so the repoint cannot collide
+    existing = through.objects.filter(**{source: primary}).values(target)
+    through.objects.filter(**{f'{source}__in': ids, f'{target}__in': existing}).delete()
+    return through.objects.filter(**{f'{source}__in': ids}).update(**{source: primary})
+
+def merge_one_to_one(relation, primary, ids):
+    model = relation.related_model
+    field = relation.field.name
+    if model._base_manager.filter(**{field: primary}).exists():
+        # The primary's row wins; the duplicates' rows go with them
+        return 0
+    first = model._base_manager.filter(**{f'{field}__in': ids}).order_by('pk').values_list('pk', flat=True).first()
+    if first is None:
+        return 0
+    return model._base_manager.filter(pk=first).update(**{field: primary})
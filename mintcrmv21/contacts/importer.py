@@ -0,0 +1,189 @@
+import csv
+import io
+import logging
+import os
+import tempfile
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from core.signals import bulk_saved
+from core.tags import normalize_tags, tag_text
+from .models import Contact
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+IMPORT_FIELDS = [
+    'type', 'first_name', 'last_name', 'company', 'title', 'email', 'phone', 'mobile',
+    'address', 'city', 'state', 'zip_code', 'country', 'status', 'notes',
+]
+# Common spreadsheet headings mapped onto Contact fields
+ALIASES = {
+    'email_address': 'email',
+    'e-mail': 'email',
+    'organization': 'company',
+    'organisation': 'company',
+    'job_title': 'title',
+    'phone_number': 'phone',
+    'zip': 'zip_code',
+    'postal_code': 'zip_code',
+    'postcode': 'zip_code',
+}
+
+class ImportFileError(Exception):
+    pass
+
+def normalize_header(header):
+    key = str(header or '').strip().lower().replace(' ', '_')
+    return ALIASES.get(key, key)
+
+def iter_csv(fileobj):
+    reader = csv.reader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+    yield from reader
+
+def iter_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('XLSX import requires openpyxl')
+    # read_only mode streams rows instead of loading the whole sheet
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ['' if value is None else str(value) for value in row]
+    finally:
+        workbook.close()
+
+def iter_records(fileobj, filename):
+    """Yield ``(row_number, {field: value})`` for each data row of a CSV or XLSX file."""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.xlsx':
+        rows = iter_xlsx(fileobj)
+    elif extension in ('.csv', '.txt'):
+        rows = iter_csv(fileobj)
+    else:
+        raise ImportFileError('Upload a .csv or .xlsx file')
+    try:
+        headers = [normalize_header(header) for header in next(rows)]
+    except StopIteration:
+        raise ImportFileError('The file is empty')
+    if 'email' not in headers or not ({'first_name', 'name'} & set(headers)):
+        raise ImportFileError('The file needs an email column and a first_name or name column')
+    for row_number, row in enumerate(rows, start=2):
+        if any(str(value).strip() for value in row):
+            yield row_number, dict(zip(headers, row))
+
+FIELDS = {name: Contact._meta.get_field(name) for name in IMPORT_FIELDS}
+
+def clean_record(record):
+    """
+    Validate one row with the model fields' own ``clean()`` (length, choices,
+    email format) rather than a serializer. Returns ``(values, errors)``.
+    """
+    record = {key: str(value).strip() for key, value in record.items() if key}
+    if record.get('name') and not record.get('first_name'):
+        parts = record['name'].split()
+        record['first_name'] = parts[0] if parts else ''
+        record['last_name'] = record.get('last_name') or ' '.join(parts[1:])
+
+    # bulk_create skips pre_save, so fill in the search copy of the tags here
+    tag_names = normalize_tags(record.get('tags'))
+    values = {'tag_names': tag_names, 'tags': tag_text(tag_names)}
+    errors = []
+    for name, field in FIELDS.items():
+        value = record.get(name, '')
+        if value == '' and field.has_default():
+            value = field.get_default()
+        try:
+            values[name] = field.clean(value, None)
+        except ValidationError as exc:
+            errors.append(f"{name}: {' '.join(exc.messages)}")
+    return values, errors
+
+class ContactImporter:
+    def __init__(self, user, chunk_size=CHUNK_SIZE):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.seen = set()
+        self.errors = []
+        self.stats = {'total_rows': 0, 'created_count': 0, 'duplicate_count': 0, 'error_count': 0}
+
+    def run(self, records):
+        chunk = []
+        for row_number, record in records:
+            self.stats['total_rows'] += 1
+            chunk.append((row_number, record))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self.stats
+
+    def import_chunk(self, chunk):
+        valid = []
+        for row_number, record in chunk:
+            values, errors = clean_record(record)
+            if errors:
+                self.errors.append((row_number, record.get('email', ''), errors))
+                continue
+            valid.append((row_number, values))
+
+        # One lookup per chunk against the lower(email) index
+        emails = {values['email'].lower() for row_number, values in valid}
+        existing = set(
+            Contact.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=emails).values_list('email_lower', flat=True)
+        )
+        contacts = []
+        for row_number, values in valid:
+            key = values['email'].lower()
+            if key in existing or key in self.seen:
+                self.stats['duplicate_count'] += 1
+                continue
+            self.seen.add(key)
+            contacts.append(Contact(created_by=self.user, **values))
+
+        with transaction.atomic():
+            Contact.objects.bulk_create(contacts)
+            bulk_saved.send(sender=Contact, instances=contacts, created=True)
+        self.stats['created_count'] += len(contacts)
+        self.stats['error_count'] = len(self.errors)
+
+    def write_error_report(self, fileobj):
+        writer = csv.writer(fileobj)
+        writer.writerow(['row', 'email', 'errors'])
+        for row_number, email, errors in self.errors:
+            writer.writerow([row_number, email, '; '.join(errors)])
+
+def run_import_job(job):
+    """Import the job's file, recording counts and an error report CSV on the job."""
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+    importer = ContactImporter(job.created_by)
+    try:
+        with job.file.open('rb') as fileobj:
+            importer.run(iter_records(fileobj, job.original_filename))
+    except (ImportFileError, csv.Error, UnicodeDecodeError) as exc:
+        job.status = 'failed'
+        job.error = str(exc)
+    except Exception as exc:
+        # Anything else still has to finish the job, or it stays 'running' for good
+        logger.exception('Contact import job %s failed', job.pk)
+        job.status = 'failed'
+        job.error = str(exc)
+    else:
+        job.status = 'completed'
+    for name, value in importer.stats.items():
+        setattr(job, name, value)
+    if importer.errors:
+        with tempfile.TemporaryFile('w+', newline='') as report:
+            importer.write_error_report(report)
+            report.seek(0)
+            job.error_report.save(f'contact-import-{job.pk}-errors.csv', File(report), save=False)
+    job.finished_at = timezone.now()
+    job.save()
+    return job
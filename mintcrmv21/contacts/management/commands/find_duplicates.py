@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from contacts.dedupe import find_all_duplicates, find_duplicates_for
+
+class Command(BaseCommand):
+    help = 'Find likely duplicate contacts and record them for review.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contact', type=int, action='append', dest='contacts',
+                            help='Only check these contact ids (repeatable)')
+
+    def handle(self, *args, **options):
+        if options['contacts']:
+            found = find_duplicates_for(options['contacts'])
+        else:
+            found = find_all_duplicates()
+        self.stdout.write(f'{found} duplicate pairs above the match threshold')
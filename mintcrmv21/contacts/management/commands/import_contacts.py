@@ -0,0 +1,43 @@
+import os
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from contacts.importer import run_import_job
+from contacts.models import ContactImportJob
+from contacts.tasks import run_contact_import
+
+class Command(BaseCommand):
+    help = 'Import contacts from a CSV or XLSX file, skipping emails that already exist.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='Username recorded as the creator')
+        parser.add_argument('--background', action='store_true', help='Queue the import on Celery and return')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} not found")
+        filename = os.path.basename(options['path'])
+        try:
+            with open(options['path'], 'rb') as source:
+                job = ContactImportJob(original_filename=filename, created_by=user)
+                job.file.save(filename, File(source), save=False)
+                job.save()
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if options['background']:
+            run_contact_import.delay(job.pk)
+            self.stdout.write(f'Queued import job {job.pk}')
+            return
+        job = run_import_job(job)
+        self.stdout.write(
+            f'{job.status}: {job.created_count} created, {job.duplicate_count} duplicates, '
+            f'{job.error_count} errors of {job.total_rows} rows'
+        )
+        if job.error:
+            self.stdout.write(job.error)
+        if job.error_report:
+            self.stdout.write(f'Error report: {job.error_report.path}')
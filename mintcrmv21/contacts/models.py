@@ -1,5 +1,9 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import Lower
 
 class Contact(models.Model):
     CONTACT_TYPE_CHOICES = [
@@ -13,6 +17,11 @@ class Contact(models.Model):
         ('prospect', 'Prospect'),
     ]
     
+    SEARCH_FIELDS = [
+        ('first_name', 'A'), ('last_name', 'A'), ('company', 'A'), ('email', 'A'),
+        ('title', 'B'), ('notes', 'C'),
+    ]
+    
     type = models.CharField(max_length=20, choices=CONTACT_TYPE_CHOICES, default='individual')
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100, blank=True)
@@ -28,14 +37,25 @@ class Contact(models.Model):
     country = models.CharField(max_length=100, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     notes = models.TextField(blank=True)
-    tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated tags")
+    tag_names = models.JSONField(default=list, blank=True)
+    tags = models.CharField(max_length=500, blank=True, editable=False, help_text="Comma-separated copy of tag_names")
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='created_contacts')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    dedupe_keys = models.JSONField(default=list, blank=True, editable=False, help_text="Blocking keys for duplicate detection")
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='contact_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='contact_search_idx'),
+            GinIndex(fields=['dedupe_keys'], name='contact_dedupe_keys_idx'),
+            GinIndex(fields=['tag_names'], name='contact_tag_names_idx'),
+            models.Index(Lower('email'), name='contact_email_lower_idx'),
+            models.Index(fields=['status', 'type'], name='contact_status_type_idx'),
+        ]
     
     def __str__(self):
         if self.type == 'organization':
@@ -46,10 +66,66 @@ class ContactNote(models.Model):
     contact = models.ForeignKey(Contact, on_delete=models.CASCADE, related_name='contact_notes')
     note = models.TextField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
     
     def __str__(self):
         return f"Note for {self.contact} by {self.created_by}"
+
+class DuplicateCandidate(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('dismissed', 'Dismissed'),
+    ]
+    
+    # Stored with contact_a_id < contact_b_id so each pair has one row
+    contact_a = models.ForeignKey(Contact, on_delete=models.CASCADE, related_name='+')
+    contact_b = models.ForeignKey(Contact, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    reasons = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-score', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['contact_a', 'contact_b'], name='duplicate_pair_unique'),
+            models.CheckConstraint(check=models.Q(contact_a__lt=models.F('contact_b')), name='duplicate_pair_ordered'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score'], name='duplicate_status_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.contact_a_id} ~ {self.contact_b_id} ({self.score:.2f})"
+
+class ContactImportJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    file = models.FileField(upload_to='contact_imports/')
+    original_filename = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    total_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    error_report = models.FileField(upload_to='contact_imports/errors/', blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='contact_imports')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.original_filename} - {self.status}"
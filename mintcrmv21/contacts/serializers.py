@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from .models import Contact, ContactNote
+from core.serializers import DynamicFieldsMixin
+from core.tags import TagListField
+from .models import Contact, ContactImportJob, ContactNote, DuplicateCandidate
 from accounts.serializers import UserSerializer
 
-class ContactNoteSerializer(serializers.ModelSerializer):
+class ContactNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -10,12 +12,12 @@ class ContactNoteSerializer(serializers.ModelSerializer):
         fields = ['id', 'note', 'created_by', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     assigned_to = UserSerializer(read_only=True)
     created_by = UserSerializer(read_only=True)
     contact_notes = ContactNoteSerializer(many=True, read_only=True)
     name = serializers.CharField(write_only=True, required=False)
-    tags = serializers.ListField(child=serializers.CharField(), required=False)
+    tags = TagListField(source='tag_names', required=False)
     
     class Meta:
         model = Contact
@@ -27,6 +29,7 @@ class ContactSerializer(serializers.ModelSerializer):
             'name'  # allow 'name' as input
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        stub_fields = ['id', 'type', 'first_name', 'last_name', 'company', 'email']
 
     def to_internal_value(self, data):
         # If 'name' is provided, split into first_name and last_name
@@ -35,17 +38,25 @@ class ContactSerializer(serializers.ModelSerializer):
             parts = name.strip().split()
             data['first_name'] = parts[0] if parts else ''
             data['last_name'] = ' '.join(parts[1:]) if len(parts) > 1 else ''
-        # Convert tags array to comma-separated string
-        tags = data.get('tags')
-        if isinstance(tags, list):
-            data['tags'] = ','.join(tags)
         # Remove extra fields not in Meta.fields
         data = {k: v for k, v in data.items() if k in self.Meta.fields}
         return super().to_internal_value(data)
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        # Convert tags string to array for frontend
-        tags_str = rep.get('tags', '')
-        rep['tags'] = [t.strip() for t in tags_str.split(',') if t.strip()]
-        return rep
+class ContactImportJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ContactImportJob
+        fields = [
+            'id', 'original_filename', 'status', 'total_rows', 'created_count',
+            'duplicate_count', 'error_count', 'error_report', 'error', 'created_at',
+            'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+class DuplicateCandidateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    contact_a = ContactSerializer(read_only=True)
+    contact_b = ContactSerializer(read_only=True)
+    
+    class Meta:
+        model = DuplicateCandidate
+        fields = ['id', 'contact_a', 'contact_b', 'score', 'reasons', 'status', 'created_at', 'updated_at']
+        read_only_fields = fields
@@ -0,0 +1,24 @@
+from django.db import transaction
+from .dedupe import refresh_keys
+
+def set_dedupe_keys(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._dedupe_keys_changed = bool(refresh_keys([instance]))
+
+def check_for_duplicates(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not getattr(instance, '_dedupe_keys_changed', False):
+        return
+    if update_fields is not None and 'dedupe_keys' not in update_fields:
+        sender.objects.filter(pk=instance.pk).update(dedupe_keys=instance.dedupe_keys)
+    schedule_duplicate_check([instance.pk])
+
+def check_bulk_for_duplicates(sender, instances, created=False, **kwargs):
+    changed = refresh_keys(instances)
+    sender.objects.bulk_update(changed, ['dedupe_keys'], batch_size=1000)
+    if changed:
+        schedule_duplicate_check([contact.pk for contact in changed])
+
+def schedule_duplicate_check(contact_ids):
+    from .tasks import find_contact_duplicates
+    transaction.on_commit(lambda: find_contact_duplicates.delay(contact_ids))
@@ -0,0 +1,20 @@
+from celery import shared_task
+from .dedupe import find_all_duplicates, find_duplicates_for
+from .importer import run_import_job
+from .models import ContactImportJob
+
+@shared_task
+def run_contact_import(job_id):
+    job = ContactImportJob.objects.select_related('created_by').get(pk=job_id)
+    if job.status != 'queued':
+        # Redelivered task; the import already ran or is running
+        return job.status
+    return run_import_job(job).status
+
+@shared_task
+def find_contact_duplicates(contact_ids):
+    return find_duplicates_for(contact_ids)
+
+@shared_task
+def find_all_contact_duplicates():
+    return find_all_duplicates()
@@ -4,5 +4,14 @@ from . import views
 urlpatterns = [
     path('', views.ContactListCreateView.as_view(), name='contact-list'),
     path('<int:pk>/', views.ContactDetailView.as_view(), name='contact-detail'),
+    path('bulk-update/', views.ContactBatchUpdateView.as_view(), name='contact-bulk-update'),
+    path('bulk-delete/', views.ContactBatchDeleteView.as_view(), name='contact-bulk-delete'),
+    path('export/', views.ContactExportView.as_view(), name='contact-export'),
     path('<int:contact_id>/notes/', views.add_contact_note, name='add-contact-note'),
+    path('<int:contact_id>/merge/', views.merge_contact, name='merge-contact'),
+    path('duplicates/', views.DuplicateCandidateListView.as_view(), name='duplicate-list'),
+    path('duplicates/<int:pk>/dismiss/', views.dismiss_duplicate, name='dismiss-duplicate'),
+    path('import/', views.import_contacts, name='import-contacts'),
+    path('import/<int:pk>/', views.ContactImportJobDetailView.as_view(), name='contact-import-detail'),
+    path('import/<int:pk>/errors/', views.contact_import_errors, name='contact-import-errors'),
 ]
@@ -1,17 +1,28 @@
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from .models import Contact, ContactNote
-from .serializers import ContactSerializer, ContactNoteSerializer
+from rest_framework.filters import OrderingFilter
+from core.filters import FullTextSearchFilter, TagFilter
+from core.batch import BatchDeleteMixin, BatchUpdateMixin
+from core.mixins import QueryPlanMixin
+from core.notes import create_notes
+from core.views import ExportMixin
+from .dedupe import merge_contacts
+from .models import Contact, ContactImportJob, ContactNote, DuplicateCandidate
+from .serializers import ContactSerializer, ContactImportJobSerializer, ContactNoteSerializer, DuplicateCandidateSerializer
+from .tasks import run_contact_import
 
-class ContactListCreateView(generics.ListCreateAPIView):
+class ContactListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TagFilter, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['type', 'status', 'assigned_to']
     search_fields = ['first_name', 'last_name', 'company', 'email']
     ordering_fields = ['created_at', 'first_name', 'last_name', 'company']
@@ -19,7 +30,21 @@ class ContactListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class ContactDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ContactExportView(ExportMixin, ContactListCreateView):
+    export_filename = 'contacts'
+    export_fields = [
+        'id', 'type', 'first_name', 'last_name', 'company', 'title', 'email', 'phone',
+        'mobile', 'address', 'city', 'state', 'zip_code', 'country', 'status', 'tags',
+        'assigned_to__username', 'created_at', 'updated_at'
+    ]
+
+class ContactBatchUpdateView(BatchUpdateMixin, ContactListCreateView):
+    batch_fields = ['type', 'status', 'assigned_to', 'company', 'title', 'city', 'state', 'country', 'tags']
+
+class ContactBatchDeleteView(BatchDeleteMixin, ContactListCreateView):
+    pass
+
+class ContactDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
@@ -27,12 +52,83 @@ class ContactDetailView(generics.RetrieveUpdateDestroyAPIView):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_contact_note(request, contact_id):
+    return create_notes(request, Contact, contact_id, ContactNoteSerializer, 'contact')
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_contacts(request):
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if not upload.name.lower().endswith(('.csv', '.xlsx')):
+        return Response({'error': 'Upload a .csv or .xlsx file'}, status=status.HTTP_400_BAD_REQUEST)
+    job = ContactImportJob(original_filename=upload.name, created_by=request.user)
+    job.file.save(upload.name, upload, save=False)
+    job.save()
+    transaction.on_commit(lambda: run_contact_import.delay(job.id))
+    return Response({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': reverse('contact-import-detail', args=[job.id], request=request),
+    }, status=status.HTTP_202_ACCEPTED)
+
+class ContactImportJobDetailView(QueryPlanMixin, generics.RetrieveAPIView):
+    serializer_class = ContactImportJobSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return ContactImportJob.objects.filter(created_by=self.request.user)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def contact_import_errors(request, pk):
+    try:
+        job = ContactImportJob.objects.get(pk=pk, created_by=request.user)
+    except ContactImportJob.DoesNotExist:
+        return Response({'error': 'Import job not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not job.error_report:
+        return Response({'error': 'This import has no errors'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(job.error_report.open('rb'), as_attachment=True,
+                        filename=f'contact-import-{job.pk}-errors.csv')
+
+class DuplicateCandidateListView(QueryPlanMixin, generics.ListAPIView):
+    """Likely duplicate pairs, best matches first; ``?contact=`` narrows to pairs involving one contact."""
+    serializer_class = DuplicateCandidateSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = DuplicateCandidate.objects.filter(status=params.get('status', 'pending'))
+        contact = params.get('contact')
+        if contact and contact.isdigit():
+            queryset = queryset.filter(Q(contact_a_id=contact) | Q(contact_b_id=contact))
+        return queryset
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dismiss_duplicate(request, pk):
+    updated = DuplicateCandidate.objects.filter(pk=pk).update(status='dismissed')
+    if not updated:
+        return Response({'error': 'Duplicate pair not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'id': pk, 'status': 'dismissed'})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def merge_contact(request, contact_id):
     try:
         contact = Contact.objects.get(id=contact_id)
-        serializer = ContactNoteSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(contact=contact, created_by=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except Contact.DoesNotExist:
         return Response({'error': 'Contact not found'}, status=status.HTTP_404_NOT_FOUND)
+    ids = request.data.get('duplicates')
+    if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) for pk in ids):
+        return Response({'error': 'duplicates must be a non-empty list of contact ids'}, status=status.HTTP_400_BAD_REQUEST)
+    duplicates = list(Contact.objects.filter(pk__in=ids).exclude(pk=contact.pk))
+    missing = sorted(set(ids) - {duplicate.pk for duplicate in duplicates} - {contact.pk})
+    if missing:
+        return Response({'error': f'Contacts not found: {missing}'}, status=status.HTTP_400_BAD_REQUEST)
+    moved = merge_contacts(contact, duplicates)
+    return Response({
+        'contact': ContactSerializer(contact, context={'request': request}).data,
+        'merged': [duplicate.pk for duplicate in duplicates],
+        'moved': moved,
+    })
@@ -0,0 +1,15 @@
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_save, pre_save
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from .signals import bulk_saved, refresh_search_vector, refresh_search_vectors, sync_tag_text
+
+        for model in apps.get_models():
+            if hasattr(model, 'SEARCH_FIELDS'):
+                post_save.connect(refresh_search_vector, sender=model, dispatch_uid=f'search_vector_{model._meta.label}')
+                bulk_saved.connect(refresh_search_vectors, sender=model, dispatch_uid=f'search_vectors_{model._meta.label}')
+            if any(field.name == 'tag_names' for field in model._meta.fields):
+                pre_save.connect(sync_tag_text, sender=model, dispatch_uid=f'tag_text_{model._meta.label}')
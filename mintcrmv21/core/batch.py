@@ -0,0 +1,205 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from django_filters.filterset import filterset_factory
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .signals import bulk_saved
+from .tags import normalize_tags, tag_text
+
+BATCH_LIMIT = 1000
+
+def filter_rows(queryset, fields, filters):
+    """
+    Narrow ``queryset`` with the list view's filters. django-filter ignores
+    unknown and blank filters, which here would select every row, so a
+    filter must name only known fields and narrow by at least one of them.
+    """
+    if not isinstance(filters, dict):
+        raise ValidationError({'filter': 'Expected an object of list filters.'})
+    filterset = filterset_factory(queryset.model, fields=fields)(data=filters, queryset=queryset)
+    unknown = sorted(set(filters) - set(filterset.filters))
+    if unknown:
+        raise ValidationError({'filter': f"Unknown filters: {', '.join(unknown)}"})
+    if all(value in (None, '', []) for value in filters.values()):
+        raise ValidationError({'filter': 'Expected at least one list filter.'})
+    if not filterset.is_valid():
+        raise ValidationError({'filter': filterset.errors})
+    return filterset.qs
+
+class BatchMixin:
+    """
+    Shared row selection for the batch endpoints: rows come from the list
+    view's queryset, chosen by ``ids`` or by a ``filter`` over the list
+    view's filter fields, and are locked for the rest of the transaction.
+    """
+    batch_limit = BATCH_LIMIT
+    http_method_names = ['post', 'options']
+
+    def select_rows(self, ids, filters):
+        queryset = self.get_queryset()
+        if filters is not None:
+            queryset = filter_rows(queryset, self.filterset_fields, filters)
+        else:
+            queryset = queryset.filter(pk__in=ids)
+
+        rows = list(queryset.select_for_update(of=('self',)).order_by('pk')[:self.batch_limit + 1])
+        if len(rows) > self.batch_limit:
+            raise ValidationError({'error': f'At most {self.batch_limit} rows can be changed at once'})
+        if filters is None:
+            missing = sorted(set(ids) - {row.pk for row in rows})
+            if missing:
+                raise ValidationError({'error': f'Not found: {missing}'})
+        return rows
+
+    def parse_ids(self, ids):
+        if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) for pk in ids):
+            raise ValidationError({'ids': 'Expected a non-empty list of integer ids.'})
+        return list(dict.fromkeys(ids))
+
+class BatchUpdateMixin(BatchMixin):
+    """
+    ``POST`` either ``{"items": [{"id": 1, "changes": {...}}, ...]}`` or
+    ``{"filter": {...}, "changes": {...}}``. Every change is validated with
+    the model fields before anything is written; the rows are then updated
+    in one transaction (one ``UPDATE`` when all rows get the same changes,
+    otherwise ``bulk_update``) and ``bulk_saved`` is sent with the previous
+    values so counters, search and other listeners stay in step.
+    """
+    batch_fields = []
+    # API names that map onto a different model field
+    batch_sources = {'tags': 'tag_names'}
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Expected a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+        items = request.data.get('items')
+        filters = request.data.get('filter')
+        if (items is None) == (filters is None):
+            return Response({'error': 'Provide either items or filter with changes'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if items is not None:
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise ValidationError({'items': 'Expected a list of {"id", "changes"} objects.'})
+            ids = self.parse_ids([item.get('id') for item in items])
+            values, errors = self.clean_all({item['id']: item.get('changes') for item in items})
+        else:
+            ids = None
+            # One patch for every matching row, so it is validated once
+            values, errors = self.clean_all({None: request.data.get('changes')})
+        if errors:
+            results = [{'id': pk, 'status': 'invalid', 'errors': row_errors} for pk, row_errors in errors.items()]
+            return Response({'error': 'No rows were changed', 'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            rows = self.select_rows(ids, filters)
+            if ids is None:
+                values = {row.pk: dict(values[None]) for row in rows}
+            updated_fields = self.apply(rows, values) if rows else []
+
+        results = [{'id': row.pk, 'status': 'updated'} for row in rows]
+        return Response({'summary': {'updated': len(rows)}, 'fields': updated_fields, 'results': results})
+
+    def clean_all(self, changes):
+        """Validated ``{pk: {attname: value}}`` and ``{pk: {field: messages}}`` for every row."""
+        values, errors = {}, {}
+        related = {}
+        for pk, row_changes in changes.items():
+            values[pk], row_errors = self.clean_changes(row_changes)
+            if row_errors:
+                errors[pk] = row_errors
+            for attname, value in values[pk].items():
+                field = self.model_field(attname)
+                if field.many_to_one and value is not None:
+                    related.setdefault(field, set()).add(value)
+
+        # One existence query per foreign key across the whole batch
+        for field, wanted in related.items():
+            found = set(field.related_model._base_manager.filter(pk__in=wanted).values_list('pk', flat=True))
+            for pk, row_values in values.items():
+                if row_values.get(field.attname) not in found | {None}:
+                    errors.setdefault(pk, {})[field.name] = [f'{field.related_model.__name__} {row_values[field.attname]} does not exist.']
+        return values, errors
+
+    def clean_changes(self, changes):
+        if not isinstance(changes, dict) or not changes:
+            return {}, {'changes': ['Expected a non-empty object of field changes.']}
+        values, errors = {}, {}
+        for name, value in changes.items():
+            if name not in self.batch_fields:
+                errors[name] = ['This field cannot be changed in a batch.']
+                continue
+            field = self.model_field(self.batch_sources.get(name, name))
+            if field.many_to_one:
+                if value is None and not field.null:
+                    errors[name] = ['This field cannot be null.']
+                elif value is not None and not isinstance(value, int):
+                    errors[name] = ['Expected an id.']
+                else:
+                    values[field.attname] = value
+                continue
+            if field.name == 'tag_names':
+                value = normalize_tags(value)
+            try:
+                values[field.attname] = field.clean(value, None)
+            except DjangoValidationError as exc:
+                errors[name] = exc.messages
+        return values, errors
+
+    def model_field(self, name):
+        # get_field() also resolves attnames such as ``assigned_to_id``
+        return self.get_queryset().model._meta.get_field(name)
+
+    def extra_changes(self, row, values):
+        """Per-row changes implied by ``values`` (e.g. timestamps); override in views."""
+        return {}
+
+    def apply(self, rows, values):
+        model = self.get_queryset().model
+        now = timezone.now()
+        auto_now = {field.attname: now for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)}
+        previous = {}
+        fields = set()
+        for row in rows:
+            row_values = {**values[row.pk], **self.extra_changes(row, values[row.pk]), **auto_now}
+            if 'tag_names' in row_values:
+                row_values['tags'] = tag_text(row_values['tag_names'])
+            previous[row.pk] = {attname: getattr(row, attname) for attname in row_values}
+            for attname, value in row_values.items():
+                setattr(row, attname, value)
+            values[row.pk] = row_values
+            fields.update(row_values)
+
+        names = sorted(self.model_field(attname).name for attname in fields)
+        distinct = {repr(sorted(row_values.items())) for row_values in values.values()}
+        if len(distinct) == 1:
+            model._base_manager.filter(pk__in=[row.pk for row in rows]).update(**values[rows[0].pk])
+        else:
+            model._base_manager.bulk_update(rows, names, batch_size=500)
+        bulk_saved.send(sender=model, instances=rows, created=False, update_fields=names, previous=previous)
+        return names
+
+class BatchDeleteMixin(BatchMixin):
+    """
+    ``POST {"ids": [...]}`` or ``{"filter": {...}}`` deletes the rows in one
+    transaction. Deletion goes through the ORM collector so cascades and
+    delete signals run as they do for a single delete.
+    """
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Expected a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+        ids = request.data.get('ids')
+        filters = request.data.get('filter')
+        if (ids is None) == (filters is None):
+            return Response({'error': 'Provide either ids or filter'}, status=status.HTTP_400_BAD_REQUEST)
+        if ids is not None:
+            ids = self.parse_ids(ids)
+
+        with transaction.atomic():
+            rows = self.select_rows(ids, filters)
+            pks = [row.pk for row in rows]
+            total, per_model = self.get_queryset().model._base_manager.filter(pk__in=pks).delete()
+
+        results = [{'id': pk, 'status': 'deleted'} for pk in pks]
+        return Response({'summary': {'deleted': len(pks)}, 'cascade': per_model, 'results': results})
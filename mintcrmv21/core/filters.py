@@ -0,0 +1,44 @@
+from django.db import connections
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+from .search import build_search_query, is_postgres, search_rank
+from .tags import normalize_tags
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on models with a stored
+    ``search_vector``: matches through the GIN index and orders by ts_rank
+    unless the client asks for another ordering. Databases other than
+    PostgreSQL fall back to SearchFilter's icontains lookups.
+    """
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        if not is_postgres(queryset) or not hasattr(queryset.model, 'SEARCH_FIELDS'):
+            return super().filter_queryset(request, queryset, view)
+        query = build_search_query(search_terms)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=search_rank(query))
+            .order_by('-search_rank', 'id')
+        )
+
+class TagFilter(BaseFilterBackend):
+    """
+    Exact tag matches on ``tag_names``: ``?tag=vip&tag=lead`` (or
+    ``?tag=vip,lead``) keeps rows carrying every listed tag, through the
+    list's GIN index. Databases without JSON containment (SQLite) compare
+    the lists in Python.
+    """
+    tag_param = 'tag'
+
+    def filter_queryset(self, request, queryset, view):
+        tags = normalize_tags(','.join(request.query_params.getlist(self.tag_param)))
+        if not tags:
+            return queryset
+        if connections[queryset.db].features.supports_json_field_contains:
+            return queryset.filter(tag_names__contains=tags)
+        wanted = set(tags)
+        return queryset.filter(pk__in=[
+            pk for pk, tag_names in queryset.values_list('pk', 'tag_names') if wanted.issubset(tag_names)
+        ])
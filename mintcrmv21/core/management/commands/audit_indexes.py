@@ -0,0 +1,111 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.urls import URLPattern, URLResolver, get_resolver
+from core.filters import FullTextSearchFilter
+from core.search import build_search_query
+
+SEQ_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN representative queries for every API view's filterset_fields, "
+        "ordering_fields and search_fields and report the ones no index can serve."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument(
+            '--fail-on-seq-scan', action='store_true',
+            help='Exit with an error status if any query falls back to a sequential scan.',
+        )
+
+    def handle(self, *args, **options):
+        self.database = options['database']
+        self.page_size = options['page_size']
+        if connections[self.database].vendor != 'postgresql':
+            raise CommandError('audit_indexes needs a PostgreSQL database.')
+
+        failures = 0
+        for route, view_class in self.iter_views():
+            queryset = self.get_base_queryset(view_class)
+            if queryset is None:
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{route} ({view_class.__name__})'))
+            for label, query in self.representative_queries(view_class, queryset):
+                plan = self.explain(query)
+                tables = sorted(set(SEQ_SCAN_RE.findall(plan)))
+                if tables:
+                    failures += 1
+                    self.stdout.write(f"  {self.style.ERROR('SEQ SCAN')} {label}: {', '.join(tables)}")
+                else:
+                    self.stdout.write(f"  {self.style.SUCCESS('ok')}       {label}")
+                if options['verbosity'] > 1:
+                    self.stdout.write('\n'.join('      ' + line for line in plan.splitlines()))
+
+        summary = f'{failures} quer{"y" if failures == 1 else "ies"} fell back to a sequential scan.'
+        if failures and options['fail_on_seq_scan']:
+            raise CommandError(summary)
+        self.stdout.write(summary)
+
+    def iter_views(self, patterns=None, prefix=''):
+        seen = set()
+        for pattern in get_resolver().url_patterns if patterns is None else patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from self.iter_views(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern):
+                view_class = getattr(pattern.callback, 'view_class', None)
+                if view_class is None or view_class in seen:
+                    continue
+                seen.add(view_class)
+                if any(getattr(view_class, name, None) for name in ('filterset_fields', 'ordering_fields', 'search_fields')):
+                    yield route, view_class
+
+    def get_base_queryset(self, view_class):
+        queryset = getattr(view_class, 'queryset', None)
+        if queryset is not None:
+            return queryset.using(self.database).all()
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+        return model._default_manager.using(self.database).all() if model else None
+
+    def representative_queries(self, view_class, queryset):
+        """
+        Filters and searches are explained unordered, so an index scan on the
+        default ordering can't hide a predicate that no index serves; orderings
+        are explained as the keyset page the list view would fetch.
+        """
+        for name in getattr(view_class, 'filterset_fields', None) or []:
+            value = self.sample_value(queryset, name)
+            if value is None:
+                self.stdout.write(f'  skipped  filter {name}: no sample value')
+                continue
+            yield f'filter {name}={value!r}', queryset.filter(**{name: value}).order_by()
+        for name in getattr(view_class, 'ordering_fields', None) or []:
+            yield f'ordering {name}', queryset.order_by(name, 'id')[:self.page_size]
+        if FullTextSearchFilter in getattr(view_class, 'filter_backends', []):
+            yield 'search (full text)', queryset.filter(search_vector=build_search_query(['term'])).order_by()
+            return
+        for name in getattr(view_class, 'search_fields', None) or []:
+            lookup = name.lstrip('^=@$') + '__icontains'
+            yield f'search {name}', queryset.filter(**{lookup: 'term'}).order_by()
+
+    def sample_value(self, queryset, name):
+        value = queryset.exclude(**{name + '__isnull': True}).values_list(name, flat=True).first()
+        if value is None:
+            field = queryset.model._meta.get_field(name)
+            if field.get_internal_type() == 'BooleanField':
+                value = True
+            elif field.choices:
+                value = field.choices[0][0]
+        return value
+
+    def explain(self, queryset):
+        # With sequential scans priced out, any Seq Scan left in the plan is
+        # one that no index can serve, however small the table is today.
+        with transaction.atomic(using=self.database):
+            with connections[self.database].cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain()
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from core.tags import normalize_tags, tag_text, tagged_models
+
+class Command(BaseCommand):
+    help = 'Fill tag_names from the legacy comma-separated tags strings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in tagged_models():
+            # Only rows never converted: strings present, list still empty
+            rows = model._default_manager.filter(tag_names=[]).exclude(tags='').values_list('pk', 'tags')
+            batch = []
+            converted = 0
+            for pk, tags in rows.iterator(chunk_size=batch_size):
+                tag_names = normalize_tags(tags)
+                batch.append(model(pk=pk, tag_names=tag_names, tags=tag_text(tag_names)))
+                if len(batch) >= batch_size:
+                    converted += self.save(model, batch)
+                    batch = []
+            converted += self.save(model, batch)
+            self.stdout.write(f'{model._meta.label}: converted {converted} rows')
+
+    def save(self, model, batch):
+        model._default_manager.bulk_update(batch, ['tag_names', 'tags'])
+        return len(batch)
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from cases.models import CaseNote
+from contacts.models import ContactNote
+from core.notes import NOTE_BATCH_SIZE, NoteImporter, iter_note_records
+from meetings.models import MeetingNote
+from reports.dashboard import invalidate
+from reports.rollups import BillableHoursRollupBuilder
+from tasks.models import TaskComment
+
+NOTE_TYPES = {
+    'case': (CaseNote, 'case'),
+    'contact': (ContactNote, 'contact'),
+    'task': (TaskComment, 'task'),
+    'meeting': (MeetingNote, 'meeting'),
+}
+
+class Command(BaseCommand):
+    help = (
+        'Stream notes from a CSV file. Columns: the parent id (case_id, contact_id, task_id or meeting_id), '
+        'note (comment for tasks), and optionally is_billable, hours_spent, created_at and created_by (a username).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--type', required=True, choices=sorted(NOTE_TYPES), help='What the notes are attached to')
+        parser.add_argument('--user', required=True, help='Author for rows without a created_by column')
+        parser.add_argument('--batch-size', type=int, default=NOTE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} not found")
+        model, parent_field = NOTE_TYPES[options['type']]
+        importer = NoteImporter(model, parent_field, user, chunk_size=options['batch_size'])
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as source:
+                stats = importer.run(iter_note_records(source))
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        # Backfilled hours land on past days the watermarked refresh would skip
+        if model is CaseNote and importer.days:
+            BillableHoursRollupBuilder().refresh(importer.days)
+            invalidate()
+        self.stdout.write(
+            f"{stats['created_count']} created, {stats['error_count']} errors of {stats['total_rows']} rows"
+        )
+        for row_number, errors in sorted(importer.errors):
+            self.stderr.write(f"Row {row_number}: {'; '.join(errors)}")
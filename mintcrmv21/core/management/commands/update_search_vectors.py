@@ -0,0 +1,25 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from core.search import update_search_vectors
+
+class Command(BaseCommand):
+    help = 'Rebuild the stored search_vector column of every searchable model in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in apps.get_models():
+            if not hasattr(model, 'SEARCH_FIELDS'):
+                continue
+            pks = model._default_manager.order_by('pk').values_list('pk', flat=True)
+            updated = 0
+            last_pk = 0
+            while True:
+                batch = list(pks.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                updated += update_search_vectors(model._default_manager.filter(pk__gte=batch[0], pk__lte=batch[-1]))
+                last_pk = batch[-1]
+            self.stdout.write(f'{model._meta.label}: {updated} rows')
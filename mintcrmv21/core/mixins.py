@@ -0,0 +1,78 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from rest_framework.exceptions import ValidationError
+from .query import plan_queryset
+
+class QueryPlanMixin:
+    """
+    Eager-load every relation the view's serializer renders, so list and
+    detail responses cost a fixed number of queries whatever the page size.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return plan_queryset(queryset, self.get_serializer())
+
+class FacetMixin:
+    """
+    ``?facets=status,priority`` adds per-value counts for the listed choice
+    or boolean fields to a list response, under the request's active
+    filters. All facets come from one aggregate of ``COUNT(*) FILTER``
+    clauses and are cached per filter signature for a few seconds.
+    """
+    facet_fields = []
+    facet_query_param = 'facets'
+    # Parameters that change the page or its shape, not the filtered rows
+    facet_ignored_params = {'facets', 'cursor', 'page', 'page_size', 'ordering', 'fields', 'expand', 'format'}
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        facets = self.get_requested_facets()
+        if facets and isinstance(response.data, dict):
+            response.data['facets'] = self.get_facets(facets)
+        return response
+
+    def get_requested_facets(self):
+        requested = [name.strip() for name in self.request.query_params.get(self.facet_query_param, '').split(',') if name.strip()]
+        unknown = [name for name in requested if name not in self.facet_fields]
+        if unknown:
+            raise ValidationError({self.facet_query_param: f"Unknown facets: {', '.join(unknown)}. Choose from {', '.join(self.facet_fields)}."})
+        return list(dict.fromkeys(requested))
+
+    def get_facets(self, names):
+        key = self.get_facet_cache_key(names)
+        facets = cache.get(key)
+        if facets is None:
+            facets = self.count_facets(self.filter_queryset(self.get_queryset()), names)
+            cache.set(key, facets, settings.FACET_CACHE_TIMEOUT)
+        return facets
+
+    def count_facets(self, queryset, names):
+        values = {name: self.facet_values(queryset.model, name) for name in names}
+        aggregates = {
+            f'{name}__{index}': models.Count('pk', filter=models.Q(**{name: value}))
+            for name in names for index, value in enumerate(values[name])
+        }
+        counts = queryset.order_by().aggregate(**aggregates)
+        return {
+            name: {str(value).lower() if isinstance(value, bool) else value: counts[f'{name}__{index}'] for index, value in enumerate(values[name])}
+            for name in names
+        }
+
+    def facet_values(self, model, name):
+        field = model._meta.get_field(name)
+        if field.choices:
+            return [value for value, label in field.flatchoices]
+        if isinstance(field, models.BooleanField):
+            return [True, False]
+        raise ImproperlyConfigured(f'Facet {model.__name__}.{name} needs choices or a BooleanField')
+
+    def get_facet_cache_key(self, names):
+        params = sorted(
+            (key, value) for key, values in self.request.query_params.lists()
+            if key not in self.facet_ignored_params for value in values
+        )
+        signature = repr((self.__class__.__name__, self.request.user.pk, names, params))
+        return 'facets:' + hashlib.md5(signature.encode('utf-8')).hexdigest()
@@ -0,0 +1,153 @@
+import csv
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .batch import BATCH_LIMIT
+
+NOTE_BATCH_SIZE = 1000
+TRUE_VALUES = {'1', 't', 'true', 'y', 'yes'}
+# Rows past this many errors are only counted
+MAX_REPORTED_ERRORS = 100
+
+def create_notes(request, parent_model, parent_id, serializer_class, parent_field):
+    """
+    Shared body of the add-note endpoints. A JSON object creates one note; a
+    JSON array creates all of them with one existence check for the parent
+    and ``bulk_create``, or none of them if any item is invalid.
+    """
+    if not parent_model.objects.filter(pk=parent_id).exists():
+        name = parent_model._meta.verbose_name.capitalize()
+        return Response({'error': f'{name} not found'}, status=status.HTTP_404_NOT_FOUND)
+    owner = {f'{parent_field}_id': parent_id, 'created_by': request.user}
+
+    if not isinstance(request.data, list):
+        serializer = serializer_class(data=request.data)
+        if serializer.is_valid():
+            serializer.save(**owner)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(request.data) > BATCH_LIMIT:
+        return Response({'error': f'At most {BATCH_LIMIT} notes can be added at once'}, status=status.HTTP_400_BAD_REQUEST)
+    serializer = serializer_class(data=request.data, many=True)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    model = serializer_class.Meta.model
+    notes = [model(**values, **owner) for values in serializer.validated_data]
+    model.objects.bulk_create(notes, batch_size=NOTE_BATCH_SIZE)
+    return Response(serializer_class(notes, many=True).data, status=status.HTTP_201_CREATED)
+
+def iter_note_records(fileobj):
+    """Yield ``(row_number, {column: value})`` for each non-blank row of a CSV file."""
+    reader = csv.reader(fileobj)
+    try:
+        headers = [header.strip().lower().replace(' ', '_') for header in next(reader)]
+    except StopIteration:
+        return
+    for row_number, row in enumerate(reader, start=2):
+        if any(value.strip() for value in row):
+            yield row_number, dict(zip(headers, row))
+
+class NoteImporter:
+    """
+    Stream note rows into ``model`` in chunks. Each chunk costs one query for
+    the parents it names, one for authors not seen before and one multi-row
+    INSERT, whatever the file size.
+    """
+    def __init__(self, model, parent_field, user, chunk_size=NOTE_BATCH_SIZE):
+        self.model = model
+        self.parent = model._meta.get_field(parent_field)
+        self.user = user
+        self.chunk_size = chunk_size
+        self.fields = [
+            field for field in model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation
+        ]
+        self.authors = {user.get_username(): user.pk}
+        # Looked up once; the current timezone is a thread-local read per call
+        self.timezone = timezone.get_current_timezone()
+        self.errors = []
+        # Local dates of the created notes, for refreshing daily rollups
+        self.days = set()
+        self.stats = {'total_rows': 0, 'created_count': 0, 'error_count': 0}
+
+    def run(self, records):
+        chunk = []
+        for row_number, record in records:
+            self.stats['total_rows'] += 1
+            chunk.append((row_number, record))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self.stats
+
+    def clean_record(self, record):
+        """Validate one row with the model fields' own ``clean()``. Returns ``(values, errors)``."""
+        record = {key: (value or '').strip() for key, value in record.items() if key}
+        values, errors = {}, []
+        parent = record.get(self.parent.attname) or record.get(self.parent.name, '')
+        try:
+            values[self.parent.attname] = int(parent)
+        except ValueError:
+            errors.append(f'{self.parent.name}: expected an id, got {parent!r}')
+        values['created_by'] = record.get('created_by') or self.user.get_username()
+
+        for field in self.fields:
+            value = record.get(field.name, '')
+            if value == '' and field.has_default():
+                value = field.get_default()
+            elif value == '' and field.null:
+                value = None
+            elif isinstance(field, models.BooleanField):
+                value = value.lower() in TRUE_VALUES
+            try:
+                values[field.attname] = field.clean(value, None)
+            except DjangoValidationError as exc:
+                errors.append(f"{field.name}: {' '.join(exc.messages)}")
+        created_at = values.get('created_at')
+        if created_at is not None and timezone.is_naive(created_at):
+            values['created_at'] = timezone.make_aware(created_at, self.timezone)
+        return values, errors
+
+    def import_chunk(self, chunk):
+        valid = []
+        for row_number, record in chunk:
+            values, errors = self.clean_record(record)
+            if errors:
+                self.add_error(row_number, errors)
+            else:
+                valid.append((row_number, values))
+
+        parent_ids = {values[self.parent.attname] for row_number, values in valid}
+        parents = set(self.parent.related_model._base_manager.filter(pk__in=parent_ids).values_list('pk', flat=True))
+        usernames = {values['created_by'] for row_number, values in valid} - set(self.authors)
+        if usernames:
+            found = dict(get_user_model()._default_manager.filter(username__in=usernames).values_list('username', 'pk'))
+            # Unknown names are remembered too, so later chunks don't look them up again
+            self.authors.update({username: found.get(username) for username in usernames})
+
+        notes = []
+        for row_number, values in valid:
+            if values[self.parent.attname] not in parents:
+                self.add_error(row_number, [f'{self.parent.name} {values[self.parent.attname]} does not exist'])
+                continue
+            author = self.authors.get(values.pop('created_by'))
+            if author is None:
+                self.add_error(row_number, ['created_by: unknown user'])
+                continue
+            notes.append(self.model(created_by_id=author, **values))
+
+        with transaction.atomic():
+            self.model.objects.bulk_create(notes, batch_size=self.chunk_size)
+        self.days.update(timezone.localdate(note.created_at, self.timezone) for note in notes)
+        self.stats['created_count'] += len(notes)
+
+    def add_error(self, row_number, errors):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, errors))
+        self.stats['error_count'] += 1
@@ -0,0 +1,214 @@
+import base64
+import datetime
+import json
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+def estimate_count(queryset):
+    """Return the PostgreSQL planner's row estimate, or None on other databases."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts the planner's estimate once a table is large."""
+    estimate_threshold = 10000
+    is_estimate = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.estimate_threshold:
+            return super().count
+        self.is_estimate = True
+        return estimate
+
+class EstimatedPageNumberPagination(PageNumberPagination):
+    django_paginator_class = EstimatedCountPaginator
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_estimate', self.page.paginator.is_estimate),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the queryset's ordering plus an ``id``
+    tie-breaker, so every page is an index range scan instead of an OFFSET.
+    Requests that pass ``?page=`` fall back to page-number pagination for
+    screens that need a total.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    tiebreaker = 'id'
+    page_number_class = EstimatedPageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if self.page_number_class.page_query_param in request.query_params:
+            self.fallback = self.page_number_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor['r']
+
+        ordering = [self.invert(order) for order in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*[self.order_expression(order) for order in ordering])
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(queryset.model, ordering, cursor['p']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        ordering = [order for order in ordering if isinstance(order, str) and order != '?']
+        if not any(order.lstrip('-') in ('pk', self.tiebreaker) for order in ordering):
+            ordering.append(self.tiebreaker)
+        return ordering
+
+    def invert(self, order):
+        return order[1:] if order.startswith('-') else '-' + order
+
+    def order_expression(self, order):
+        # Keep NULL placement symmetric so reversing the ordering reverses the rows
+        if order.startswith('-'):
+            return F(order[1:]).desc(nulls_first=True)
+        return F(order).asc(nulls_last=True)
+
+    def keyset_filter(self, model, ordering, position):
+        """Rows strictly after ``position`` in ``ordering``."""
+        branches = []
+        equal = Q()
+        for order, value in zip(ordering, position):
+            name = order.lstrip('-')
+            nullable = self.is_nullable(model, name)
+            if order.startswith('-'):
+                after = Q(**{name + '__isnull': False}) if value is None else Q(**{name + '__lt': value})
+            elif value is None:
+                after = None
+            else:
+                after = Q(**{name + '__gt': value})
+                if nullable:
+                    after |= Q(**{name + '__isnull': True})
+            if after is not None:
+                branches.append(equal & after)
+            equal &= Q(**{name + '__isnull': True}) if value is None else Q(**{name: value})
+        if not branches:
+            return Q(pk__in=[])
+        return reduce(or_, branches)
+
+    def is_nullable(self, model, name):
+        try:
+            return model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return name != 'pk'
+
+    def get_position(self, instance):
+        position = []
+        for order in self.ordering:
+            value = instance
+            for part in order.lstrip('-').split('__'):
+                value = getattr(value, part, None)
+                if value is None:
+                    break
+            if hasattr(value, '_meta'):
+                value = value.pk
+            position.append(value)
+        return position
+
+    def encode_value(self, value):
+        # Keep full microsecond precision, unlike DjangoJSONEncoder
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        return str(value)
+
+    def encode_cursor(self, instance, reverse):
+        payload = json.dumps({'p': self.get_position(instance), 'r': int(reverse)}, default=self.encode_value)
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if not isinstance(cursor['p'], list) or len(cursor['p']) != len(self.ordering):
+                raise ValueError
+            if cursor['r'] not in (0, 1):
+                raise ValueError
+            cursor['r'] = bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
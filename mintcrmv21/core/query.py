@@ -0,0 +1,50 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+def get_related_lookups(serializer, model, prefix=''):
+    """
+    Walk the serializer's field tree and collect the select_related and
+    prefetch_related lookups needed to render it without per-row queries.
+    """
+    select_related = []
+    prefetch_related = []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*' or '.' in field.source:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        lookup = prefix + field.source
+        if isinstance(field, serializers.ListSerializer):
+            # Nested many=True serializers get their own planned queryset
+            related_model = model_field.related_model
+            queryset = plan_queryset(related_model._default_manager.all(), field.child)
+            prefetch_related.append(Prefetch(lookup, queryset=queryset))
+        elif isinstance(field, serializers.ManyRelatedField):
+            prefetch_related.append(lookup)
+        elif isinstance(field, serializers.BaseSerializer):
+            if model_field.many_to_many or model_field.one_to_many:
+                continue
+            select_related.append(lookup)
+            nested_select, nested_prefetch = get_related_lookups(
+                field, model_field.related_model, prefix=lookup + '__'
+            )
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+    return select_related, prefetch_related
+
+def plan_queryset(queryset, serializer):
+    """Apply the lookups returned by get_related_lookups() to a queryset."""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    select_related, prefetch_related = get_related_lookups(serializer, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
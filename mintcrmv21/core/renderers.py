@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON. Streaming views write rows themselves; this
+    renders anything else (errors, single objects) as one line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=encoders.JSONEncoder) + '\n').encode(self.charset)
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV for export views, which stream rows themselves; this renders
+    anything else (validation errors) as ``field,message`` lines.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for key, value in data.items():
+            writer.writerow([key, value if isinstance(value, str) else json.dumps(value, cls=encoders.JSONEncoder)])
+        return buffer.getvalue().encode(self.charset)
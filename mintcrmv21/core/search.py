@@ -0,0 +1,37 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+
+def is_postgres(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+def build_search_vector(search_fields):
+    """Combine ``(field, weight)`` pairs into one weighted tsvector expression."""
+    vector = None
+    for name, weight in search_fields:
+        part = SearchVector(name, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+def build_search_query(terms):
+    """AND the terms together, each matching as a prefix so partial words hit."""
+    lexemes = []
+    for term in terms:
+        term = re.sub(r"[\\':]", '', term).strip()
+        if term:
+            lexemes.append(f"'{term}':*")
+    return SearchQuery(' & '.join(lexemes), search_type='raw', config=SEARCH_CONFIG)
+
+def search_rank(query):
+    # ts_rank returns real; cast so the value round-trips exactly through cursors
+    return Cast(SearchRank(F('search_vector'), query), FloatField())
+
+def update_search_vectors(queryset):
+    """Recompute the stored search_vector column for every row in queryset."""
+    if not is_postgres(queryset):
+        return 0
+    return queryset.order_by().update(search_vector=build_search_vector(queryset.model.SEARCH_FIELDS))
@@ -0,0 +1,82 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+def parse_field_tree(value):
+    """Turn ``'id,case.title,case.client'`` into a nested dict of field names."""
+    tree = {}
+    for path in value.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+class DynamicFieldsMixin:
+    """
+    Render nested relations as compact stubs (``Meta.stub_fields``) or ids
+    unless they are expanded. On read requests the root serializer takes its
+    shape from ``?fields=`` (dotted paths reach into nested objects) and
+    ``?expand=`` (e.g. ``case.client``); nested serializers receive theirs
+    through the ``fields`` and ``expand`` keyword arguments.
+    """
+    def __init__(self, *args, **kwargs):
+        self._requested_fields = kwargs.pop('fields', None)
+        self._expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = self.get_shape()
+        if requested is not None:
+            fields = {name: field for name, field in fields.items() if name in requested}
+
+        for name, field in fields.items():
+            many = isinstance(field, serializers.ListSerializer)
+            nested = field.child if many else field
+            if not isinstance(nested, serializers.BaseSerializer):
+                continue
+            sub_fields = requested.get(name) if requested else None
+            if name in expand or sub_fields:
+                fields[name] = self.expand_field(field, sub_fields or None, expand.get(name, {}))
+            else:
+                fields[name] = self.collapse_field(field)
+        return fields
+
+    def get_shape(self):
+        if self._requested_fields is not None or self._expand is not None:
+            return self._requested_fields, self._expand or {}
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self.is_root():
+            return None, {}
+        requested = request.query_params.get('fields')
+        return (
+            parse_field_tree(requested) if requested else None,
+            parse_field_tree(request.query_params.get('expand', '')),
+        )
+
+    def is_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def expand_field(self, field, requested, expand):
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, DynamicFieldsMixin):
+            return field
+        kwargs = dict(nested._kwargs, fields=requested, expand=expand)
+        if many:
+            kwargs['many'] = True
+        return nested.__class__(*nested._args, **kwargs)
+
+    def collapse_field(self, field):
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        stub_fields = getattr(getattr(nested, 'Meta', None), 'stub_fields', None)
+        if stub_fields and not many:
+            return self.expand_field(field, {name: {} for name in stub_fields}, {})
+        kwargs = {'read_only': True}
+        if 'source' in nested._kwargs:
+            kwargs['source'] = nested._kwargs['source']
+        return serializers.PrimaryKeyRelatedField(many=many, **kwargs)
@@ -0,0 +1,25 @@
+from django.dispatch import Signal
+from .search import update_search_vectors
+from .tags import normalize_tags, tag_text
+
+# Sent with ``instances`` and ``created`` after rows are written with
+# bulk_create (created=True) or bulk_update/update, which bypass post_save.
+# Updates may also pass ``update_fields`` and ``previous``, mapping each pk
+# to the changed fields' old values by attname.
+bulk_saved = Signal()
+
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None:
+        searched = {name for name, weight in sender.SEARCH_FIELDS}
+        if not searched.intersection(update_fields):
+            return
+    update_search_vectors(sender._default_manager.filter(pk=instance.pk))
+
+def refresh_search_vectors(sender, instances, **kwargs):
+    update_search_vectors(sender._default_manager.filter(pk__in=[instance.pk for instance in instances]))
+
+def sync_tag_text(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance.tag_names = normalize_tags(instance.tag_names)
+    instance.tags = tag_text(instance.tag_names)
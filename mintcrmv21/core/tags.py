@@ -0,0 +1,75 @@
+import re
+from collections import defaultdict
+from django.apps import apps
+from django.db import connection
+from rest_framework import serializers
+
+MAX_TAG_LENGTH = 50
+
+def normalize_tags(value):
+    """
+    Lowercased, whitespace-collapsed, de-duplicated tags in first-seen order
+    from a list or a comma/semicolon separated string.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = re.split(r'[,;]', value)
+    tags = []
+    for tag in value:
+        tag = ' '.join(str(tag).split()).lower()[:MAX_TAG_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+def tag_text(tags, max_length=500):
+    """The comma-separated copy kept in ``tags`` for full-text search, cut at a whole tag."""
+    text = ','.join(tags)
+    if len(text) > max_length:
+        text = text[:max_length + 1].rsplit(',', 1)[0]
+    return text
+
+class TagListField(serializers.ListField):
+    """A list of tags; also accepts the legacy comma-separated string."""
+    child = serializers.CharField(max_length=MAX_TAG_LENGTH)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = normalize_tags(data)
+        return normalize_tags(super().to_internal_value(data))
+
+def tagged_models():
+    return [model for model in apps.get_models() if any(field.name == 'tag_names' for field in model._meta.fields)]
+
+def tag_counts(models, prefix='', limit=100):
+    """
+    ``[(tag, count_per_model...)]`` for the most used tags. On PostgreSQL
+    one query expands every model's ``tag_names`` and counts them together;
+    other databases count the lists in Python.
+    """
+    if connection.vendor != 'postgresql':
+        return counted_in_python(models, prefix, limit)
+    quote = connection.ops.quote_name
+    tagged = ' UNION ALL '.join(
+        f'SELECT jsonb_array_elements_text({quote("tag_names")}) AS tag, {index} AS source FROM {quote(model._meta.db_table)}'
+        for index, model in enumerate(models)
+    )
+    counts = ', '.join(f'COUNT(*) FILTER (WHERE source = {index})' for index in range(len(models)))
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    sql = (
+        f'SELECT tag, {counts} FROM ({tagged}) tagged WHERE tag LIKE %s '
+        f'GROUP BY tag ORDER BY COUNT(*) DESC, tag LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [escaped + '%', limit])
+        return cursor.fetchall()
+
+def counted_in_python(models, prefix, limit):
+    counts = defaultdict(lambda: [0] * len(models))
+    for index, model in enumerate(models):
+        for tag_names in model._default_manager.values_list('tag_names', flat=True).iterator():
+            for tag in tag_names:
+                if tag.startswith(prefix):
+                    counts[tag][index] += 1
+    ranked = sorted(counts.items(), key=lambda item: (-sum(item[1]), item[0]))
+    return [(tag, *row) for tag, row in ranked[:limit]]
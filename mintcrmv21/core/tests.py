@@ -0,0 +1,176 @@
+import datetime
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from accounts.models import User
+from cases.models import Case, CaseDocument, CaseNote
+from contacts.models import Contact, ContactImportJob, ContactNote
+from documents.models import Document, DocumentVersion
+from emails.models import Email, EmailAttachment
+from meetings.models import Meeting, MeetingNote
+from portal.models import PortalDocument, PortalRequest
+from reports.models import Report, ReportJob, ScheduledReport
+from tasks.models import Task, TaskComment
+from workflows.models import Workflow, WorkflowExecution, WorkflowStep
+
+ROWS = 6
+
+# (list url, ?expand= covering every nested relation its serializer renders)
+LIST_CREATE_VIEWS = [
+    ('/api/auth/users/', ''),
+    ('/api/contacts/', 'assigned_to,created_by,contact_notes'),
+    ('/api/cases/', 'client,assigned_lawyer,team_members,created_by,case_notes,case_documents'),
+    ('/api/tasks/', 'assigned_to,case,contact,created_by,comments'),
+    ('/api/documents/', 'uploaded_by,versions'),
+    ('/api/meetings/', 'organizer,attendees,external_attendees,case,meeting_notes'),
+    ('/api/emails/', 'sent_by,attachments'),
+    ('/api/reports/', 'created_by,scheduled_reports'),
+    ('/api/workflows/', 'created_by,steps,executions'),
+    ('/api/portal/requests/', 'contact,assigned_to'),
+    ('/api/portal/documents/', 'contact,uploaded_by'),
+]
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryPlanTests(APITestCase):
+    """
+    List and detail responses must cost the same number of queries however
+    many rows, or related rows per row, they render.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='planner', password='pass', email='planner@example.com', role='admin')
+        colleague = User.objects.create_user(username='colleague', password='pass', email='colleague@example.com', role='lawyer')
+        now = timezone.now()
+        cls.objects = {}
+        for i in range(ROWS):
+            # Rows differ in how many related rows they carry
+            children = range(i % 3 + 1)
+            member = User.objects.create_user(username=f'member{i}', password='pass', email=f'member{i}@example.com', role='paralegal')
+            contact = Contact.objects.create(
+                first_name=f'First{i}', last_name=f'Last{i}', email=f'contact{i}@example.com',
+                assigned_to=colleague, created_by=cls.user,
+            )
+            case = Case.objects.create(
+                case_number=f'CASE-{i:03}', title=f'Case {i}', description='Description', case_type='litigation',
+                client=contact, assigned_lawyer=colleague, created_by=cls.user,
+            )
+            case.team_members.add(colleague, member)
+            task = Task.objects.create(
+                title=f'Task {i}', description='Description', assigned_to=colleague, case=case, contact=contact,
+                created_by=cls.user,
+            )
+            document = Document.objects.create(
+                title=f'Document {i}', document_type='other', file='documents/file.pdf', case=case, contact=contact,
+                uploaded_by=cls.user,
+            )
+            meeting = Meeting.objects.create(
+                title=f'Meeting {i}', meeting_type='other', start_time=now + datetime.timedelta(days=i),
+                end_time=now + datetime.timedelta(days=i, hours=1), case=case, organizer=cls.user,
+            )
+            meeting.external_attendees.add(contact)
+            email = Email.objects.create(
+                subject=f'Email {i}', body='Body', from_email='planner@example.com', to_emails=contact.email,
+                case=case, contact=contact, sent_by=cls.user,
+            )
+            report = Report.objects.create(name=f'Report {i}', report_type='case_summary', created_by=cls.user)
+            job = ReportJob.objects.create(report=report, requested_by=cls.user, status='completed', result={})
+            workflow = Workflow.objects.create(name=f'Workflow {i}', trigger_event='case.created', created_by=cls.user)
+            portal_request = PortalRequest.objects.create(
+                contact=contact, request_type='support', subject=f'Request {i}', description='Description',
+                assigned_to=colleague,
+            )
+            portal_document = PortalDocument.objects.create(
+                contact=contact, title=f'Portal document {i}', document='portal_documents/file.pdf', uploaded_by=cls.user,
+            )
+            import_job = ContactImportJob.objects.create(original_filename='contacts.csv', created_by=cls.user)
+            for n in children:
+                ContactNote.objects.create(contact=contact, note='Note', created_by=colleague)
+                CaseNote.objects.create(case=case, note='Note', created_by=colleague)
+                CaseDocument.objects.create(case=case, title=f'Attachment {n}', document='case_documents/file.pdf', uploaded_by=colleague)
+                TaskComment.objects.create(task=task, comment='Comment', created_by=colleague)
+                DocumentVersion.objects.create(document=document, version=f'1.{n}', file='document_versions/file.pdf', uploaded_by=colleague)
+                MeetingNote.objects.create(meeting=meeting, note='Note', created_by=colleague)
+                meeting.attendees.add(cls.user if n % 2 else colleague)
+                EmailAttachment.objects.create(email=email, file='email_attachments/file.pdf', filename=f'file{n}.pdf')
+                ScheduledReport.objects.create(report=report, frequency='weekly', recipients='a@example.com', next_send=now)
+                WorkflowStep.objects.create(workflow=workflow, name=f'Step {n}', step_type='create_task', order=n)
+                WorkflowExecution.objects.create(workflow=workflow, trigger_data={})
+            cls.objects[i] = {
+                '/api/auth/users/': member,
+                '/api/contacts/': contact,
+                '/api/cases/': case,
+                '/api/tasks/': task,
+                '/api/documents/': document,
+                '/api/meetings/': meeting,
+                '/api/emails/': email,
+                '/api/reports/': report,
+                '/api/workflows/': workflow,
+                '/api/portal/requests/': portal_request,
+                '/api/portal/documents/': portal_document,
+                '/api/reports/jobs/': job,
+                '/api/contacts/import/': import_job,
+            }
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def assertSameQueryCount(self, first, second):
+        """``second`` costs exactly as many queries as ``first``. Returns its response."""
+        # Warm process-wide caches (content types, trigger index) first
+        self.client.get(first)
+        with CaptureQueriesContext(connection) as baseline:
+            response = self.client.get(first)
+        self.assertEqual(response.status_code, 200, response.data)
+        with self.assertNumQueries(len(baseline)):
+            response = self.client.get(second)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for url, expand in LIST_CREATE_VIEWS:
+            for shape in [''] + ([f'&expand={expand}'] if expand else []):
+                with self.subTest(url=url, expand=bool(shape)):
+                    response = self.assertSameQueryCount(f'{url}?page_size=2{shape}', f'{url}?page_size={ROWS}{shape}')
+                    self.assertGreaterEqual(len(response.data['results']), ROWS)
+
+    def test_detail_queries_do_not_grow_with_related_rows(self):
+        detail_views = LIST_CREATE_VIEWS + [
+            ('/api/reports/jobs/', ''),
+            ('/api/contacts/import/', ''),
+        ]
+        for url, expand in detail_views:
+            # Row 0 has one related row of each kind, row 2 has three
+            few, many = self.objects[0][url], self.objects[2][url]
+            for shape in [''] + ([f'?expand={expand}'] if expand else []):
+                with self.subTest(url=url, expand=bool(shape)):
+                    self.assertSameQueryCount(f'{url}{few.pk}/{shape}', f'{url}{many.pk}/{shape}')
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BatchFilterTests(APITestCase):
+    """A batch filter that would not narrow the list selects nothing."""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='batcher', password='pass', email='batcher@example.com', role='admin')
+        for i in range(ROWS):
+            Contact.objects.create(first_name=f'First{i}', last_name=f'Last{i}', email=f'contact{i}@example.com', created_by=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_unknown_or_empty_filter_changes_nothing(self):
+        for filters in [{'statsu': 'active'}, {'status': 'active', 'statsu': 'active'}, {}, {'status': ''}]:
+            with self.subTest(filters=filters):
+                response = self.client.post('/api/contacts/bulk-update/', {'filter': filters, 'changes': {'status': 'inactive'}}, format='json')
+                self.assertEqual(response.status_code, 400, response.data)
+                self.assertIn('filter', response.data)
+                response = self.client.post('/api/contacts/bulk-delete/', {'filter': filters}, format='json')
+                self.assertEqual(response.status_code, 400, response.data)
+                self.assertIn('filter', response.data)
+        self.assertEqual(Contact.objects.filter(status='active').count(), ROWS)
+
+    def test_known_filter_changes_matching_rows(self):
+        response = self.client.post('/api/contacts/bulk-update/', {'filter': {'status': 'active'}, 'changes': {'status': 'inactive'}}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(Contact.objects.filter(status='inactive').count(), ROWS)
@@ -0,0 +1,169 @@
+import csv
+import datetime
+import io
+import json
+from itertools import islice
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import generics
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+from .mixins import QueryPlanMixin
+from .renderers import CSVRenderer, NDJSONRenderer
+from .tags import normalize_tags, tag_counts, tagged_models
+
+class PersonalFeedView(QueryPlanMixin, generics.ListAPIView):
+    """
+    Base for the "my ..." endpoints: rows belonging to the requesting user,
+    narrowed by ``?start=``/``?end=`` on ``date_field`` and a comma-separated
+    ``?status=``. Responses are cursor-paginated, or streamed as NDJSON with
+    ``?format=ndjson`` so memory stays flat however long the history is.
+    """
+    owner_field = None
+    date_field = None
+    status_field = 'status'
+    stream_chunk_size = 500
+    permission_classes = [IsAuthenticated]
+    filter_backends = [OrderingFilter]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(**{self.owner_field: self.request.user})
+        params = self.request.query_params
+
+        start = self.parse_bound(params.get('start'), 'start')
+        if start:
+            queryset = queryset.filter(**{self.date_field + '__gte': start})
+        end = self.parse_bound(params.get('end'), 'end')
+        if end:
+            queryset = queryset.filter(**{self.date_field + '__lt': end})
+
+        statuses = [value for value in params.get('status', '').split(',') if value]
+        if statuses:
+            queryset = queryset.filter(**{self.status_field + '__in': statuses})
+        return queryset
+
+    def parse_bound(self, value, name):
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+            if day is not None:
+                # A bare end date includes the whole day
+                if name == 'end':
+                    day += datetime.timedelta(days=1)
+                parsed = datetime.datetime.combine(day, datetime.time.min)
+            else:
+                parsed = parse_datetime(value)
+                if parsed is None:
+                    raise ValueError
+        except ValueError:
+            raise ValidationError({name: 'Enter a valid date or datetime.'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            queryset = self.filter_queryset(self.get_queryset())
+            return StreamingHttpResponse(self.stream(queryset), content_type=NDJSONRenderer.media_type)
+        return super().list(request, *args, **kwargs)
+
+    def stream(self, queryset):
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                break
+            data = self.get_serializer(chunk, many=True).data
+            yield ''.join(json.dumps(item, cls=encoders.JSONEncoder) + '\n' for item in data)
+
+class ExportMixin:
+    """
+    Turns a list view into a download of every matching row. The list
+    view's filters, search and ``?ordering=`` apply unchanged, but rows are
+    read as ``values(*export_fields)`` through a server-side cursor and
+    written chunk by chunk as CSV (default) or NDJSON (``?format=ndjson``),
+    so memory and time to first byte do not grow with the export.
+    """
+    export_fields = None
+    export_filename = None
+    export_chunk_size = 2000
+    # Primary-key order lets the cursor start returning rows without a sort
+    ordering = ['id']
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    http_method_names = ['get', 'options']
+
+    def filter_queryset(self, queryset):
+        # values() rows need none of QueryPlanMixin's eager loading
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.export_fields)
+        renderer = request.accepted_renderer
+        if renderer.format == NDJSONRenderer.format:
+            content = self.stream_ndjson(queryset)
+        else:
+            content = self.stream_csv(queryset)
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        response['Content-Disposition'] = f'attachment; filename="{self.export_filename}.{renderer.format}"'
+        return response
+
+    def iter_chunks(self, queryset):
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.export_chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def stream_csv(self, queryset):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.export_fields)
+        for chunk in self.iter_chunks(queryset):
+            writer.writerows([self.csv_value(row[name]) for name in self.export_fields] for row in chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def stream_ndjson(self, queryset):
+        for chunk in self.iter_chunks(queryset):
+            yield ''.join(json.dumps(row, cls=encoders.JSONEncoder) + '\n' for row in chunk)
+
+    def csv_value(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, cls=encoders.JSONEncoder)
+        return value
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def tag_cloud(request):
+    """Tag usage across contacts and documents, most used first; ``?prefix=`` for autocomplete."""
+    try:
+        limit = min(max(int(request.query_params.get('limit', 100)), 1), 500)
+    except ValueError:
+        raise ValidationError({'limit': 'Enter a whole number.'})
+    prefix = normalize_tags(request.query_params.get('prefix', ''))
+    models = tagged_models()
+    names = [str(model._meta.verbose_name_plural) for model in models]
+    results = []
+    for tag, *counts in tag_counts(models, prefix[0] if prefix else '', limit):
+        row = {'tag': tag, 'total': sum(counts)}
+        row.update(zip(names, counts))
+        results.append(row)
+    return Response({'results': results})
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from cases.models import Case
 from contacts.models import Contact
 
@@ -14,21 +16,31 @@ class Document(models.Model):
         ('other', 'Other'),
     ]
     
+    SEARCH_FIELDS = [('title', 'A'), ('tags', 'B'), ('description', 'B')]
+    
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     document_type = models.CharField(max_length=50, choices=DOCUMENT_TYPE_CHOICES)
     file = models.FileField(upload_to='documents/')
     case = models.ForeignKey(Case, on_delete=models.CASCADE, null=True, blank=True, related_name='documents')
     contact = models.ForeignKey(Contact, on_delete=models.CASCADE, null=True, blank=True, related_name='documents')
-    tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated tags")
+    tag_names = models.JSONField(default=list, blank=True)
+    tags = models.CharField(max_length=500, blank=True, editable=False, help_text="Comma-separated copy of tag_names")
     is_confidential = models.BooleanField(default=False)
     version = models.CharField(max_length=20, default='1.0')
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='document_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='document_search_idx'),
+            GinIndex(fields=['tag_names'], name='document_tag_names_idx'),
+            models.Index(fields=['document_type', '-created_at'], name='document_type_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
+from core.tags import TagListField
 from .models import Document, DocumentVersion
 from accounts.serializers import UserSerializer
 
-class DocumentVersionSerializer(serializers.ModelSerializer):
+class DocumentVersionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -10,9 +12,10 @@ class DocumentVersionSerializer(serializers.ModelSerializer):
         fields = ['id', 'version', 'file', 'changes', 'uploaded_by', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     versions = DocumentVersionSerializer(many=True, read_only=True)
+    tags = TagListField(source='tag_names', required=False)
     
     class Meta:
         model = Document
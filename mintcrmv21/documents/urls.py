@@ -4,5 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.DocumentListCreateView.as_view(), name='document-list'),
     path('<int:pk>/', views.DocumentDetailView.as_view(), name='document-detail'),
+    path('bulk-update/', views.DocumentBatchUpdateView.as_view(), name='document-bulk-update'),
+    path('bulk-delete/', views.DocumentBatchDeleteView.as_view(), name='document-bulk-delete'),
     path('<int:document_id>/versions/', views.upload_document_version, name='upload-document-version'),
 ]
@@ -3,23 +3,33 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from core.filters import FullTextSearchFilter, TagFilter
+from core.batch import BatchDeleteMixin, BatchUpdateMixin
+from core.mixins import FacetMixin, QueryPlanMixin
 from .models import Document, DocumentVersion
 from .serializers import DocumentSerializer, DocumentVersionSerializer
 
-class DocumentListCreateView(generics.ListCreateAPIView):
+class DocumentListCreateView(FacetMixin, QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TagFilter, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['document_type', 'case', 'contact', 'is_confidential']
+    facet_fields = ['document_type', 'is_confidential']
     search_fields = ['title', 'description', 'tags']
     ordering_fields = ['created_at', 'title']
     
     def perform_create(self, serializer):
         serializer.save(uploaded_by=self.request.user)
 
-class DocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DocumentBatchUpdateView(BatchUpdateMixin, DocumentListCreateView):
+    batch_fields = ['title', 'description', 'document_type', 'case', 'contact', 'tags', 'is_confidential']
+
+class DocumentBatchDeleteView(BatchDeleteMixin, DocumentListCreateView):
+    pass
+
+class DocumentDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated]
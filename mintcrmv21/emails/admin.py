@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Email, EmailAttachment
+from .models import Email, EmailAttachment, EmailThread
 
 class EmailAttachmentInline(admin.TabularInline):
     model = EmailAttachment
@@ -16,3 +16,9 @@ class EmailAdmin(admin.ModelAdmin):
 @admin.register(EmailAttachment)
 class EmailAttachmentAdmin(admin.ModelAdmin):
     list_display = ['filename', 'email', 'file']
+
+@admin.register(EmailThread)
+class EmailThreadAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'message_count', 'case', 'last_message_at']
+    search_fields = ['subject']
+    readonly_fields = ['created_at', 'updated_at']
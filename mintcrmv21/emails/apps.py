@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+class EmailsConfig(AppConfig):
+    name = 'emails'
+
+    def ready(self):
+        from core.signals import bulk_saved
+        from .models import Email
+        from .signals import refresh_email_thread, thread_bulk_emails, thread_new_email
+
+        post_save.connect(thread_new_email, sender=Email, dispatch_uid='email_thread_save')
+        bulk_saved.connect(thread_bulk_emails, sender=Email, dispatch_uid='email_thread_bulk')
+        post_delete.connect(refresh_email_thread, sender=Email, dispatch_uid='email_thread_delete')
@@ -0,0 +1,73 @@
+import smtplib
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.mail.message import sanitize_address
+from .mime import StreamingEmailMessage
+
+def dot_stuff(chunks):
+    """
+    Apply SMTP transparency (RFC 5321 4.5.2) across chunk boundaries:
+    a line starting with "." gets an extra ".".
+    """
+    last = b'\n'
+    for chunk in chunks:
+        if not chunk:
+            continue
+        data = (last + chunk).replace(b'\n.', b'\n..')[1:]
+        last = chunk[-1:]
+        yield data
+
+class StreamingSMTPBackend(EmailBackend):
+    """
+    SMTP backend that writes StreamingEmailMessage instances to the DATA
+    command chunk by chunk instead of building the whole message first.
+    Other messages are sent exactly as by Django's SMTP backend.
+    """
+
+    def _send(self, email_message):
+        if not isinstance(email_message, StreamingEmailMessage):
+            return super()._send(email_message)
+        if not email_message.recipients():
+            return False
+        encoding = email_message.encoding or 'utf-8'
+        from_email = sanitize_address(email_message.from_email, encoding)
+        recipients = [sanitize_address(address, encoding) for address in email_message.recipients()]
+        try:
+            self.send_streaming(from_email, recipients, email_message)
+        except smtplib.SMTPException:
+            if not self.fail_silently:
+                raise
+            return False
+        return True
+
+    def send_streaming(self, from_email, recipients, email_message):
+        connection = self.connection
+        connection.ehlo_or_helo_if_needed()
+        options = []
+        if connection.does_esmtp and connection.has_extn('size'):
+            options.append(f'SIZE={email_message.check_size()}')
+        code, response = connection.mail(from_email, options)
+        if code != 250:
+            connection.rset()
+            raise smtplib.SMTPSenderRefused(code, response, from_email)
+
+        refused = {}
+        for recipient in recipients:
+            code, response = connection.rcpt(recipient)
+            if code not in (250, 251):
+                refused[recipient] = (code, response)
+        if len(refused) == len(recipients):
+            connection.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, response = connection.docmd('data')
+        if code != 354:
+            connection.rset()
+            raise smtplib.SMTPDataError(code, response)
+        tail = b''
+        for data in dot_stuff(email_message.stream()):
+            connection.send(data)
+            tail = (tail + data)[-2:]
+        connection.send(b'.\r\n' if tail == b'\r\n' else b'\r\n.\r\n')
+        code, response = connection.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, response)
@@ -0,0 +1,217 @@
+import datetime
+import smtplib
+from django.core.exceptions import ValidationError
+from django.core.mail import get_connection
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from .mime import MessageTooLarge, StreamingEmailMessage
+from .models import Email
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF = datetime.timedelta(minutes=1)
+# How long a worker may hold claimed emails before another worker takes them over
+CLAIM_TIMEOUT = datetime.timedelta(minutes=30)
+OUTBOX_STATUSES = ['queued', 'sending']
+# Retrying won't help when the server rejects the addresses or the message is too big
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, MessageTooLarge)
+OUTCOME_FIELDS = ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at', 'sent_by', 'updated_at']
+
+def split_addresses(value):
+    return [address.strip() for address in value.split(',') if address.strip()]
+
+def sending_problems(email):
+    """Address and size problems that would make sending ``email`` pointless."""
+    recipients = split_addresses(email.to_emails) + split_addresses(email.cc_emails) + split_addresses(email.bcc_emails)
+    if not split_addresses(email.to_emails):
+        return ['No recipients']
+    errors = []
+    for address in [email.from_email] + recipients:
+        try:
+            validate_email(address)
+        except ValidationError:
+            errors.append(f'Invalid address: {address}')
+    try:
+        build_message(email).check_size()
+    except MessageTooLarge as exc:
+        errors.append(str(exc))
+    return errors
+
+def message_headers(email):
+    headers = {}
+    if email.message_id:
+        headers['Message-ID'] = f'<{email.message_id}>'
+    if email.in_reply_to:
+        headers['In-Reply-To'] = f'<{email.in_reply_to}>'
+    if email.references:
+        headers['References'] = ' '.join(f'<{ref}>' for ref in email.references.split())
+    return headers
+
+def build_message(email, connection=None):
+    """
+    A StreamingEmailMessage carrying the email's attachments as storage
+    references; their bytes are only read while the message is sent.
+    """
+    return StreamingEmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=split_addresses(email.to_emails),
+        cc=split_addresses(email.cc_emails),
+        bcc=split_addresses(email.bcc_emails),
+        connection=connection,
+        headers=message_headers(email),
+        files=[(attachment.filename, attachment.file) for attachment in email.attachments.all()],
+    )
+
+def send_each(emails, connection):
+    """
+    Send every email over the already open ``connection``, one message at a
+    time so a failure is attributed to its own email. Yields ``(email, error)``.
+    """
+    for email in emails:
+        try:
+            connection.send_messages([build_message(email, connection)])
+        except Exception as exc:
+            yield email, exc
+            # The session may be unusable after an error; start a fresh one for the rest
+            connection.close()
+            try:
+                connection.open()
+            except Exception:
+                pass
+        else:
+            yield email, None
+
+def record_outcome(email, error, now, retry=True):
+    """Apply a delivery attempt's result to ``email`` without saving it."""
+    email.attempts += 1
+    email.updated_at = now
+    email.next_attempt_at = None
+    if error is None:
+        email.status = 'sent'
+        email.sent_at = now
+        email.last_error = ''
+        return
+    email.last_error = str(error)
+    if retry and not isinstance(error, PERMANENT_ERRORS) and email.attempts < MAX_ATTEMPTS:
+        email.next_attempt_at = now + RETRY_BACKOFF * 2 ** (email.attempts - 1)
+    else:
+        email.status = 'failed'
+
+def send_now(email):
+    """Deliver a single email synchronously, marking it sent or failed."""
+    now = timezone.now()
+    try:
+        with get_connection() as connection:
+            [(email, error)] = send_each([email], connection)
+    except Exception as exc:
+        error = exc
+    record_outcome(email, error, now, retry=False)
+    email.save()
+    return error
+
+def send_many(emails, batch_size=BATCH_SIZE):
+    """
+    Deliver ``emails`` synchronously over one SMTP session, saving outcomes
+    with one bulk_update per batch. Returns ``{email id: error or None}``.
+    """
+    now = timezone.now()
+    errors = {}
+    try:
+        with get_connection() as connection:
+            for start in range(0, len(emails), batch_size):
+                batch = emails[start:start + batch_size]
+                for email, error in send_each(batch, connection):
+                    record_outcome(email, error, now, retry=False)
+                    errors[email.pk] = error
+                Email.objects.bulk_update(batch, OUTCOME_FIELDS)
+    except Exception as exc:
+        # Could not reach the server; everything not yet attempted fails with that error
+        unsent = [email for email in emails if email.pk not in errors]
+        for email in unsent:
+            record_outcome(email, exc, now, retry=False)
+            errors[email.pk] = exc
+        Email.objects.bulk_update(unsent, OUTCOME_FIELDS)
+    return errors
+
+def queue(email, user):
+    email.status = 'queued'
+    email.sent_by = user
+    email.attempts = 0
+    email.last_error = ''
+    email.next_attempt_at = timezone.now()
+
+def queue_many(emails, user):
+    now = timezone.now()
+    for email in emails:
+        queue(email, user)
+        email.updated_at = now
+    Email.objects.bulk_update(emails, OUTCOME_FIELDS, batch_size=BATCH_SIZE)
+
+def claim(emails, user):
+    """
+    Mark ``emails`` as ``sending`` for a synchronous send that will happen
+    once the caller's transaction commits. If the process dies before the
+    outcome is saved, the claim expires and the outbox worker picks them up.
+    """
+    now = timezone.now()
+    for email in emails:
+        email.status = 'sending'
+        email.sent_by = user
+        email.next_attempt_at = now + CLAIM_TIMEOUT
+        email.updated_at = now
+    Email.objects.bulk_update(emails, OUTCOME_FIELDS, batch_size=BATCH_SIZE)
+
+def claim_batch(now, batch_size):
+    """
+    Mark up to ``batch_size`` due emails as ``sending`` and commit, so the
+    row locks are only held for the claim, not for the SMTP session. The
+    claim expires after CLAIM_TIMEOUT, when a worker that died mid-batch
+    has its emails picked up again.
+    """
+    with transaction.atomic():
+        batch = list(
+            Email.objects.select_for_update(skip_locked=True)
+            .filter(status__in=OUTBOX_STATUSES, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        Email.objects.filter(pk__in=[email.pk for email in batch]).update(
+            status='sending', next_attempt_at=now + CLAIM_TIMEOUT, updated_at=now,
+        )
+    return batch
+
+def drain_outbox(batch_size=BATCH_SIZE):
+    """
+    Deliver queued emails that are due, ``batch_size`` at a time over one
+    SMTP session per batch. Rows are claimed with SKIP LOCKED so concurrent
+    workers share the outbox without sending anything twice, and each
+    outcome is saved as soon as the email has been tried.
+    """
+    total = 0
+    while True:
+        now = timezone.now()
+        batch = claim_batch(now, batch_size)
+        if not batch:
+            return total
+        prefetch_related_objects(batch, 'attachments')
+        tried = set()
+        try:
+            with get_connection() as connection:
+                for email, error in send_each(batch, connection):
+                    # Back in the queue unless the attempt settles it
+                    email.status = 'queued'
+                    record_outcome(email, error, now)
+                    email.save(update_fields=OUTCOME_FIELDS)
+                    tried.add(email.pk)
+        except Exception:
+            # Could not reach the server; release the rest of the claim for the next run
+            Email.objects.filter(status='sending', pk__in=[email.pk for email in batch if email.pk not in tried]).update(
+                status='queued', next_attempt_at=now,
+            )
+            raise
+        total += len(batch)
+        if len(batch) < batch_size:
+            return total
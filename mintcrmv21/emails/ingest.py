@@ -0,0 +1,234 @@
+import hashlib
+import logging
+import mailbox
+import os
+import re
+from email import policy
+from email.parser import BytesParser
+from email.utils import getaddresses, parseaddr, parsedate_to_datetime
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower, Upper
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from cases.models import Case
+from contacts.models import Contact
+from core.signals import bulk_saved
+from .models import Email, EmailAttachment
+from .threading import parse_message_ids
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Matches case numbers such as CASE-2024-001; candidates are checked against real cases
+CASE_NUMBER_PATTERN = re.compile(r'\b[A-Z][A-Z0-9]*-[A-Z0-9-]*[0-9]\b', re.IGNORECASE)
+CASE_SCAN_CHARS = 2000
+MBOX_FROM_QUOTE = re.compile(r'^>+From ', re.MULTILINE)
+
+def iter_mailbox(path):
+    """
+    Yield raw messages from an mbox file or a Maildir directory one at a
+    time, so only the current message is held in memory.
+    """
+    if os.path.isdir(path):
+        box = mailbox.Maildir(path, factory=None, create=False)
+    else:
+        box = mailbox.mbox(path, factory=None, create=False)
+    try:
+        for key in box.iterkeys():
+            yield box.get_bytes(key)
+    finally:
+        box.close()
+
+def normalize_message_id(value):
+    return (value or '').strip().strip('<>').strip()[:255]
+
+def addresses(message, header):
+    return [address.lower() for name, address in getaddresses(message.get_all(header, [])) if address]
+
+class MailImporter:
+    """
+    Turns raw RFC 5322 messages into received ``Email`` rows in batches.
+    Contacts and cases are looked up in dictionaries built once per run.
+    Duplicates are skipped by Message-ID, both against the database and
+    within the run, and a message that cannot be parsed is skipped on its
+    own rather than failing its batch.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, storage=None):
+        self.batch_size = batch_size
+        self.storage = storage or default_storage
+        self.parser = BytesParser(policy=policy.default)
+        self.contacts = dict(
+            Contact.objects.annotate(email_lower=Lower('email')).order_by('id').values_list('email_lower', 'id')
+        )
+        self.cases = {
+            number: (case_id, client_id)
+            for number, case_id, client_id in Case.objects.annotate(number=Upper('case_number')).values_list('number', 'id', 'client_id')
+        }
+        self.seen = set()
+        self.stats = {'read': 0, 'created': 0, 'duplicates': 0, 'malformed': 0, 'attachments': 0, 'linked': 0}
+
+    def run(self, raw_messages):
+        batch = []
+        for raw in raw_messages:
+            self.stats['read'] += 1
+            batch.append(raw)
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch)
+                batch = []
+        if batch:
+            self.import_batch(batch)
+        return self.stats
+
+    def import_batch(self, raw_messages):
+        parsed = []
+        for raw in raw_messages:
+            try:
+                message = self.parser.parsebytes(raw)
+                message_id = normalize_message_id(message['Message-ID']) or self.fallback_message_id(message)
+            except Exception:
+                self.skip_malformed()
+                continue
+            if message_id in self.seen:
+                self.stats['duplicates'] += 1
+                continue
+            self.seen.add(message_id)
+            parsed.append((message_id, message))
+
+        existing = set(
+            Email.objects.exclude(message_id='')
+            .filter(message_id__in=[message_id for message_id, message in parsed])
+            .values_list('message_id', flat=True)
+        )
+        self.stats['duplicates'] += len(existing)
+        emails, messages = [], []
+        for message_id, message in parsed:
+            if message_id in existing:
+                continue
+            try:
+                emails.append(self.build_email(message_id, message))
+            except Exception:
+                self.skip_malformed()
+                continue
+            messages.append(message)
+        if not emails:
+            return
+
+        with transaction.atomic():
+            emails, messages = self.save_emails(emails, messages)
+            bulk_saved.send(sender=Email, instances=emails, created=True)
+        self.stats['created'] += len(emails)
+
+        # Files are written only once their emails are committed, so a failed batch leaves none behind
+        attachments = []
+        for email, message in zip(emails, messages):
+            attachments.extend(self.store_attachments(email, message))
+        EmailAttachment.objects.bulk_create(attachments)
+        self.stats['attachments'] += len(attachments)
+
+    def skip_malformed(self):
+        logger.exception('Skipping a message that could not be parsed')
+        self.stats['malformed'] += 1
+
+    def save_emails(self, emails, messages):
+        """
+        Insert the batch in one statement. If another import inserted one of
+        the Message-IDs in the meantime, fall back to a savepoint per email
+        so only the clashing ones are skipped.
+        """
+        try:
+            with transaction.atomic():
+                return Email.objects.bulk_create(emails), messages
+        except IntegrityError:
+            pass
+        saved = []
+        for email, message in zip(emails, messages):
+            email.pk = None
+            try:
+                with transaction.atomic():
+                    email.save(force_insert=True)
+            except IntegrityError:
+                self.stats['duplicates'] += 1
+                continue
+            saved.append((email, message))
+        return [email for email, message in saved], [message for email, message in saved]
+
+    def fallback_message_id(self, message):
+        # Messages without a Message-ID still need a key that is stable across mbox and Maildir copies
+        body_part = message.get_body(preferencelist=('plain', 'html'))
+        key = '\n'.join(
+            [str(message.get(header, '')) for header in ('From', 'To', 'Date', 'Subject')]
+            # mbox escapes body lines starting with "From " as ">From "
+            + [MBOX_FROM_QUOTE.sub('From ', body_part.get_content()) if body_part is not None else '']
+        )
+        return f"{hashlib.sha1(key.encode('utf-8', 'replace')).hexdigest()}@import.mintcrm"
+
+    def build_email(self, message_id, message):
+        sender = parseaddr(str(message.get('From', '')))[1].lower()
+        recipients = addresses(message, 'To')
+        body_part = message.get_body(preferencelist=('plain', 'html'))
+        body = body_part.get_content() if body_part is not None else ''
+        subject = str(message.get('Subject', '') or '')
+        try:
+            sent_at = parsedate_to_datetime(str(message['Date']))
+            if timezone.is_naive(sent_at):
+                sent_at = timezone.make_aware(sent_at)
+        except (TypeError, ValueError):
+            sent_at = None
+
+        case_id, contact_id = self.link(subject, body, [sender] + recipients)
+        if case_id or contact_id:
+            self.stats['linked'] += 1
+        return Email(
+            subject=subject[:200],
+            body=body,
+            from_email=sender[:254],
+            to_emails=', '.join(recipients),
+            cc_emails=', '.join(addresses(message, 'Cc')),
+            status='received',
+            sent_at=sent_at,
+            message_id=message_id,
+            in_reply_to=(parse_message_ids(str(message.get('In-Reply-To', ''))) or [''])[0][:255],
+            references=' '.join(parse_message_ids(str(message.get('References', '')))),
+            case_id=case_id,
+            contact_id=contact_id,
+        )
+
+    def link(self, subject, body, participants):
+        case_id = contact_id = None
+        for candidate in CASE_NUMBER_PATTERN.findall(f"{subject}\n{body[:CASE_SCAN_CHARS]}"):
+            if candidate.upper() in self.cases:
+                case_id, contact_id = self.cases[candidate.upper()]
+                break
+        for address in participants:
+            if address in self.contacts:
+                contact_id = self.contacts[address]
+                break
+        return case_id, contact_id
+
+    def store_attachments(self, email, message):
+        try:
+            parts = list(message.iter_attachments())
+        except Exception:
+            logger.exception('Skipping the attachments of email %s', email.pk)
+            return
+        for part in parts:
+            try:
+                payload = part.get_payload(decode=True)
+                if payload is None:
+                    continue
+                try:
+                    filename = get_valid_filename(part.get_filename() or 'attachment')
+                except SuspiciousFileOperation:
+                    filename = 'attachment'
+                name = self.storage.save(f'email_attachments/{filename}', ContentFile(payload))
+            except Exception:
+                logger.exception('Skipping an attachment of email %s', email.pk)
+                continue
+            yield EmailAttachment(email=email, file=name, filename=filename[:200])
+
+def import_mail(path, batch_size=BATCH_SIZE):
+    return MailImporter(batch_size=batch_size).run(iter_mailbox(path))
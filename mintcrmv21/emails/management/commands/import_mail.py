@@ -0,0 +1,16 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from emails.ingest import BATCH_SIZE, import_mail
+
+class Command(BaseCommand):
+    help = 'Import received email from an mbox file or Maildir directory, skipping known Message-IDs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='mbox file or Maildir directory')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f"{options['path']} does not exist")
+        stats = import_mail(options['path'], batch_size=options['batch_size'])
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in stats.items()))
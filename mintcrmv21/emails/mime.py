@@ -0,0 +1,120 @@
+import base64
+import mimetypes
+import re
+import uuid
+from email.mime.base import MIMEBase
+from django.conf import settings
+from django.core.mail import EmailMessage
+
+# Multiple of 57 bytes so every chunk encodes to whole 76-character base64 lines
+CHUNK_SIZE = 57 * 1024
+LINESEP = b'\r\n'
+
+class MessageTooLarge(ValueError):
+    pass
+
+def guess_mimetype(filename):
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+def read_full(fileobj, size):
+    # Storage backends may return short reads; keep chunks aligned to 57 bytes
+    data = fileobj.read(size)
+    while data and len(data) < size:
+        more = fileobj.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+def encode_file(fieldfile, chunk_size=CHUNK_SIZE):
+    """Yield the base64 encoding of ``fieldfile`` a chunk at a time."""
+    fieldfile.open('rb')
+    try:
+        while True:
+            chunk = read_full(fieldfile, chunk_size)
+            if not chunk:
+                break
+            yield base64.encodebytes(chunk).replace(b'\n', LINESEP)
+    finally:
+        fieldfile.close()
+
+class StreamingEmailMessage(EmailMessage):
+    """
+    EmailMessage whose file attachments stay in storage until the message is
+    written out: ``stream()`` yields the RFC 5322 bytes with each file
+    base64-encoded chunk by chunk, so memory use doesn't grow with
+    attachment size. ``message()`` still builds the whole thing in memory
+    for backends that need it (console, locmem, file).
+    """
+
+    def __init__(self, *args, files=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (filename, FieldFile) pairs
+        self.files = list(files or [])
+
+    def attachment_size(self):
+        return sum(fieldfile.size for filename, fieldfile in self.files)
+
+    def estimated_size(self):
+        # base64 grows content by 4/3 plus line breaks; headers and body are small next to it
+        return self.attachment_size() * 4 // 3 * 78 // 76 + len(self.body.encode('utf-8')) + 4096
+
+    def check_size(self, limit=None):
+        limit = limit or settings.EMAIL_MAX_MESSAGE_SIZE
+        size = self.estimated_size()
+        if size > limit:
+            raise MessageTooLarge(f'Message is about {size} bytes, over the {limit} byte limit')
+        return size
+
+    def message(self):
+        self.check_size()
+        original = self.attachments
+        self.attachments = list(original)
+        for filename, fieldfile in self.files:
+            fieldfile.open('rb')
+            try:
+                self.attach(filename, fieldfile.read(), guess_mimetype(filename))
+            finally:
+                fieldfile.close()
+        try:
+            return super().message()
+        finally:
+            self.attachments = original
+
+    def placeholder_message(self):
+        """The MIME tree with a unique token standing in for each file's payload."""
+        original = self.attachments
+        self.attachments = list(original)
+        tokens = []
+        for filename, fieldfile in self.files:
+            token = f'streamed-attachment-{uuid.uuid4().hex}'
+            part = MIMEBase(*guess_mimetype(filename).split('/', 1))
+            part.set_payload(token)
+            part['Content-Transfer-Encoding'] = 'base64'
+            try:
+                filename.encode('ascii')
+            except UnicodeEncodeError:
+                filename = ('utf-8', '', filename)
+            part.add_header('Content-Disposition', 'attachment', filename=filename)
+            self.attachments.append(part)
+            tokens.append(token.encode('ascii'))
+        try:
+            return super().message(), tokens
+        finally:
+            self.attachments = original
+
+    def stream(self):
+        """Yield the serialized message with CRLF line endings, piece by piece."""
+        self.check_size()
+        msg, tokens = self.placeholder_message()
+        skeleton = msg.as_bytes(linesep='\r\n')
+        if not tokens:
+            yield skeleton
+            return
+        pieces = re.split(b'(' + b'|'.join(tokens) + b')', skeleton)
+        files = dict(zip(tokens, (fieldfile for filename, fieldfile in self.files)))
+        for piece in pieces:
+            if piece in files:
+                yield from encode_file(files[piece])
+            elif piece:
+                yield piece
@@ -1,17 +1,46 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from cases.models import Case
 from contacts.models import Contact
 from accounts.models import User
 
+class EmailThread(models.Model):
+    subject = models.CharField(max_length=200)
+    normalized_subject = models.CharField(max_length=200, blank=True)
+    case = models.ForeignKey(Case, on_delete=models.SET_NULL, null=True, blank=True, related_name='email_threads')
+    message_count = models.PositiveIntegerField(default=0)
+    participants = models.JSONField(default=list, blank=True)
+    first_message_at = models.DateTimeField(default=timezone.now)
+    last_message_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-last_message_at']
+        indexes = [
+            models.Index(fields=['-last_message_at', 'id'], name='thread_last_id_idx'),
+            models.Index(fields=['normalized_subject', '-last_message_at'], name='thread_subject_idx'),
+            GinIndex(fields=['participants'], name='thread_participants_idx'),
+        ]
+    
+    def __str__(self):
+        return self.subject
+
 class Email(models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
         ('sent', 'Sent'),
         ('received', 'Received'),
         ('failed', 'Failed'),
     ]
     
+    SEARCH_FIELDS = [('subject', 'A'), ('from_email', 'B'), ('to_emails', 'B'), ('body', 'C')]
+    
     subject = models.CharField(max_length=200)
     body = models.TextField()
     from_email = models.EmailField()
@@ -29,11 +58,30 @@ class Email(models.Model):
         blank=True,
     )
     sent_at = models.DateTimeField(null=True, blank=True)
+    message_id = models.CharField(max_length=255, blank=True, help_text="Message-ID header without angle brackets")
+    in_reply_to = models.CharField(max_length=255, blank=True)
+    references = models.TextField(blank=True, help_text="Space-separated Message-IDs, oldest first")
+    thread = models.ForeignKey(EmailThread, on_delete=models.SET_NULL, null=True, blank=True, related_name='messages')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='email_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='email_search_idx'),
+            models.Index(fields=['status', '-created_at'], name='email_status_created_idx'),
+            models.Index(fields=['case', '-created_at'], name='email_case_created_idx'),
+            models.Index(fields=['-sent_at', 'id'], name='email_sent_id_idx'),
+            models.Index(fields=['next_attempt_at'], name='email_outbox_idx', condition=models.Q(status__in=['queued', 'sending'])),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['message_id'], condition=~models.Q(message_id=''), name='email_message_id_unique'),
+        ]
     
     def __str__(self):
         return self.subject
@@ -0,0 +1,18 @@
+from .threading import new_message_id, refresh_threads, thread_emails
+
+def thread_new_email(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    if not instance.message_id:
+        # Outgoing mail needs its own Message-ID so replies can find the thread
+        instance.message_id = new_message_id()
+        sender.objects.filter(pk=instance.pk).update(message_id=instance.message_id)
+    thread_emails([instance])
+
+def thread_bulk_emails(sender, instances, created=False, **kwargs):
+    if created:
+        thread_emails(instances)
+
+def refresh_email_thread(sender, instance, **kwargs):
+    if instance.thread_id:
+        refresh_threads({instance.thread_id})
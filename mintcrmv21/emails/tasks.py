@@ -0,0 +1,11 @@
+from celery import shared_task
+from .delivery import drain_outbox as drain
+from .ingest import import_mail as run_import
+
+@shared_task
+def drain_outbox():
+    return drain()
+
+@shared_task
+def import_mail(path, batch_size=500):
+    return run_import(path, batch_size=batch_size)
@@ -0,0 +1,123 @@
+import datetime
+import re
+from django.core.mail.utils import DNS_NAME
+from django.db.models import Count, Max, Min
+from django.db.models.functions import Coalesce
+from email.utils import make_msgid
+from .models import Email, EmailThread
+
+REPLY_PREFIX = re.compile(r'^\s*(?:(?:re|fw|fwd|aw|sv|wg)\s*(?:\[\d+\])?\s*:\s*|\[[^\]]*\]\s*)+', re.IGNORECASE)
+MESSAGE_ID = re.compile(r'<([^<>\s]+)>')
+# Only fall back to matching subjects against threads active this recently
+SUBJECT_WINDOW = datetime.timedelta(days=30)
+MAX_PARTICIPANTS = 50
+
+def normalize_subject(subject):
+    return ' '.join(REPLY_PREFIX.sub('', subject or '').split()).lower()[:200]
+
+def parse_message_ids(value):
+    """Message-IDs from a header value, without angle brackets."""
+    found = MESSAGE_ID.findall(value or '')
+    return found or [part.strip('<>') for part in (value or '').split() if part.strip('<>')]
+
+def new_message_id():
+    return make_msgid(domain=DNS_NAME).strip('<>')
+
+def message_time(email):
+    return email.sent_at or email.created_at
+
+def parents(email):
+    """Referenced Message-IDs, nearest ancestor first."""
+    ids = parse_message_ids(email.references)
+    if email.in_reply_to:
+        ids.append(email.in_reply_to)
+    return list(dict.fromkeys(reversed(ids)))
+
+def participants(email):
+    addresses = [email.from_email] + email.to_emails.split(',') + email.cc_emails.split(',')
+    return [address.strip().lower() for address in addresses if address.strip()]
+
+def thread_emails(emails):
+    """
+    Attach each email without a thread to its conversation: the thread of
+    the nearest referenced message, else a recent thread with the same
+    normalized subject for replies, else a new thread. Emails in the same
+    batch that reference each other share a thread. Saves ``thread`` with a
+    bulk_update and refreshes the touched threads' aggregates.
+    """
+    emails = sorted((email for email in emails if email.thread_id is None), key=message_time)
+    if not emails:
+        return
+    in_batch = {email.message_id: email for email in emails if email.message_id}
+    referenced = {ref for email in emails for ref in parents(email)} - in_batch.keys()
+    known = dict(
+        Email.objects.exclude(message_id='').filter(message_id__in=referenced, thread__isnull=False)
+        .values_list('message_id', 'thread_id')
+    )
+
+    subjects = {normalize_subject(email.subject) for email in emails} - {''}
+    by_subject = {}
+    if subjects:
+        recent = EmailThread.objects.filter(
+            normalized_subject__in=subjects,
+            last_message_at__gte=message_time(emails[0]) - SUBJECT_WINDOW,
+        ).order_by('last_message_at')
+        by_subject = {thread.normalized_subject: thread for thread in recent}
+
+    assigned = {}
+    created = []
+    for email in emails:
+        thread = None
+        for ref in parents(email):
+            if ref in known:
+                thread = known[ref]
+                break
+            if ref in in_batch and in_batch[ref] in assigned:
+                thread = assigned[in_batch[ref]]
+                break
+        normalized = normalize_subject(email.subject)
+        is_reply = bool(parents(email)) or bool(REPLY_PREFIX.match(email.subject or ''))
+        if thread is None and is_reply and normalized in by_subject:
+            thread = by_subject[normalized]
+        if thread is None:
+            thread = EmailThread(
+                subject=(email.subject or '')[:200], normalized_subject=normalized, case_id=email.case_id,
+                first_message_at=message_time(email), last_message_at=message_time(email),
+            )
+            created.append(thread)
+            if normalized:
+                by_subject[normalized] = thread
+        assigned[email] = thread
+
+    EmailThread.objects.bulk_create(created)
+    for email, thread in assigned.items():
+        email.thread_id = thread if isinstance(thread, int) else thread.pk
+    Email.objects.bulk_update(emails, ['thread'])
+    refresh_threads({email.thread_id for email in emails}, emails)
+
+def refresh_threads(thread_ids, new_emails=()):
+    """Recompute count and first/last times, and merge in participants of ``new_emails``."""
+    threads = EmailThread.objects.in_bulk(thread_ids)
+    stats = list(Email.objects.filter(thread__in=thread_ids).order_by().values('thread').annotate(
+        count=Count('id'),
+        first=Min(Coalesce('sent_at', 'created_at')),
+        last=Max(Coalesce('sent_at', 'created_at')),
+    ))
+    for row in stats:
+        thread = threads[row['thread']]
+        thread.message_count = row['count']
+        thread.first_message_at = row['first']
+        thread.last_message_at = row['last']
+    for email in new_emails:
+        thread = threads[email.thread_id]
+        merged = list(dict.fromkeys(thread.participants + participants(email)))
+        thread.participants = merged[:MAX_PARTICIPANTS]
+        if thread.case_id is None:
+            thread.case_id = email.case_id
+    counted = {row['thread'] for row in stats}
+    empty = [pk for pk in threads if pk not in counted]
+    EmailThread.objects.filter(pk__in=empty).delete()
+    EmailThread.objects.bulk_update(
+        [thread for pk, thread in threads.items() if pk not in empty],
+        ['message_count', 'first_message_at', 'last_message_at', 'participants', 'case'],
+    )
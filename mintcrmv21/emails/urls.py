@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('', views.EmailListCreateView.as_view(), name='email-list'),
     path('<int:pk>/', views.EmailDetailView.as_view(), name='email-detail'),
+    path('export/', views.EmailExportView.as_view(), name='email-export'),
+    path('bulk-send/', views.bulk_send_emails, name='bulk-send-emails'),
+    path('threads/', views.EmailThreadListView.as_view(), name='email-thread-list'),
     path('<int:email_id>/send/', views.send_email, name='send-email'),
     path('<int:email_id>/attachments/', views.add_email_attachment, name='add-email-attachment'),
 ]
@@ -3,26 +3,63 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from django.core.mail import send_mail
-from django.utils import timezone
-from .models import Email, EmailAttachment
-from .serializers import EmailSerializer, EmailAttachmentSerializer
+from rest_framework.filters import OrderingFilter
+from core.filters import FullTextSearchFilter
+from django.conf import settings
+from django.db import connections, transaction
+from core.batch import filter_rows
+from core.mixins import QueryPlanMixin
+from core.views import ExportMixin
+from .delivery import claim, queue, queue_many, send_many, send_now, sending_problems
+from .models import Email, EmailAttachment, EmailThread
+from .serializers import EmailSerializer, EmailAttachmentSerializer, EmailThreadSerializer
+from .tasks import drain_outbox
 
-class EmailListCreateView(generics.ListCreateAPIView):
+class EmailListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Email.objects.all()
     serializer_class = EmailSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['status', 'case', 'contact']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    filterset_fields = ['status', 'case', 'contact', 'thread']
     search_fields = ['subject', 'body', 'from_email', 'to_emails']
     ordering_fields = ['created_at', 'sent_at']
 
-class EmailDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EmailExportView(ExportMixin, EmailListCreateView):
+    export_filename = 'emails'
+    export_fields = [
+        'id', 'subject', 'status', 'from_email', 'to_emails', 'cc_emails', 'case_id',
+        'contact_id', 'thread_id', 'message_id', 'sent_by__username', 'sent_at', 'created_at'
+    ]
+
+class EmailDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Email.objects.all()
     serializer_class = EmailSerializer
     permission_classes = [IsAuthenticated]
 
+class EmailThreadListView(QueryPlanMixin, generics.ListAPIView):
+    """
+    Conversations, most recently active first; ``?participant=`` narrows to
+    an address through the participants GIN index. Databases without JSON
+    containment (SQLite) compare the lists in Python.
+    """
+    queryset = EmailThread.objects.all()
+    serializer_class = EmailThreadSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['case']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        participant = self.request.query_params.get('participant')
+        if not participant:
+            return queryset
+        participant = participant.strip().lower()
+        if connections[queryset.db].features.supports_json_field_contains:
+            return queryset.filter(participants__contains=[participant])
+        return queryset.filter(pk__in=[
+            pk for pk, participants in queryset.values_list('pk', 'participants') if participant in participants
+        ])
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def send_email(request, email_id):
@@ -30,30 +67,93 @@ def send_email(request, email_id):
         email = Email.objects.get(id=email_id)
         if email.status != 'draft':
             return Response({'error': 'Email already sent'}, status=status.HTTP_400_BAD_REQUEST)
+        problems = sending_problems(email)
+        if problems:
+            return Response({'error': '; '.join(problems)}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Send email using Django's send_mail
-        try:
-            send_mail(
-                subject=email.subject,
-                message=email.body,
-                from_email=email.from_email,
-                recipient_list=email.to_emails.split(','),
-                fail_silently=False,
-            )
-            email.status = 'sent'
-            email.sent_by = request.user
-            email.sent_at = timezone.now()
+        if settings.EMAIL_OUTBOX_ENABLED:
+            queue(email, request.user)
             email.save()
-            
-            return Response({'message': 'Email sent successfully'})
-        except Exception as e:
-            email.status = 'failed'
-            email.save()
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            transaction.on_commit(drain_outbox.delay)
+            return Response({'message': 'Email queued for delivery', 'status': email.status}, status=status.HTTP_202_ACCEPTED)
+        
+        email.sent_by = request.user
+        error = send_now(email)
+        if error is not None:
+            return Response({'error': str(error)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({'message': 'Email sent successfully'})
             
     except Email.DoesNotExist:
         return Response({'error': 'Email not found'}, status=status.HTTP_404_NOT_FOUND)
 
+BULK_SEND_LIMIT = 1000
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_send_emails(request):
+    """
+    Send many drafts at once, chosen by ``ids`` or by a ``filter`` using the
+    list endpoint's filter fields. Every draft is checked up front from one
+    query and the response reports the outcome for each email.
+    """
+    if not isinstance(request.data, dict):
+        return Response({'error': 'Expected a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+    ids = request.data.get('ids')
+    filters = request.data.get('filter')
+    if bool(ids) == bool(filters):
+        return Response({'error': 'Provide either ids or filter'}, status=status.HTTP_400_BAD_REQUEST)
+    if filters and not isinstance(filters, dict):
+        return Response({'error': 'filter must be an object of list filters'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with transaction.atomic():
+        if ids:
+            if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+                return Response({'error': 'ids must be a list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = Email.objects.filter(id__in=ids)
+        else:
+            queryset = filter_rows(Email.objects.filter(status='draft'), EmailListCreateView.filterset_fields, filters)
+            
+        emails = list(queryset.select_for_update().prefetch_related('attachments').order_by('id')[:BULK_SEND_LIMIT + 1])
+        if len(emails) > BULK_SEND_LIMIT:
+            return Response({'error': f'At most {BULK_SEND_LIMIT} emails can be sent at once'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        found = {email.id for email in emails}
+        results = {pk: {'id': pk, 'status': 'not_found', 'error': 'Email not found'} for pk in ids or [] if pk not in found}
+        sendable = []
+        for email in emails:
+            if email.status != 'draft':
+                results[email.id] = {'id': email.id, 'status': 'skipped', 'error': 'Email already sent'}
+                continue
+            problems = sending_problems(email)
+            if problems:
+                results[email.id] = {'id': email.id, 'status': 'invalid', 'error': '; '.join(problems)}
+            else:
+                sendable.append(email)
+        
+        if settings.EMAIL_OUTBOX_ENABLED:
+            queue_many(sendable, request.user)
+            transaction.on_commit(drain_outbox.delay)
+            for email in sendable:
+                results[email.id] = {'id': email.id, 'status': email.status}
+        else:
+            # Claim the drafts and commit before talking to SMTP, so the row
+            # locks are not held for the whole session
+            claim(sendable, request.user)
+    
+    if not settings.EMAIL_OUTBOX_ENABLED:
+        errors = send_many(sendable)
+        for email in sendable:
+            results[email.id] = {'id': email.id, 'status': email.status}
+            if errors[email.id] is not None:
+                results[email.id]['error'] = str(errors[email.id])
+    
+    order = ids or [email.id for email in emails]
+    results = [results[pk] for pk in dict.fromkeys(order)]
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return Response({'summary': summary, 'results': results})
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_email_attachment(request, email_id):
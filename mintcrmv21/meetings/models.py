@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from cases.models import Case
 from contacts.models import Contact
 
@@ -39,6 +40,11 @@ class Meeting(models.Model):
     
     class Meta:
         ordering = ['start_time']
+        indexes = [
+            models.Index(fields=['start_time', 'id'], name='meeting_start_id_idx'),
+            models.Index(fields=['organizer', 'start_time'], name='meeting_organizer_start_idx'),
+            models.Index(fields=['status', 'start_time'], name='meeting_status_start_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.start_time}"
@@ -47,7 +53,7 @@ class MeetingNote(models.Model):
     meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='meeting_notes')
     note = models.TextField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
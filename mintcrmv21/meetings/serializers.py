@@ -1,11 +1,12 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Meeting, MeetingNote
 from accounts.serializers import UserSerializer
 from contacts.serializers import ContactSerializer
 from cases.serializers import CaseSerializer
 import datetime
 
-class MeetingNoteSerializer(serializers.ModelSerializer):
+class MeetingNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -13,7 +14,7 @@ class MeetingNoteSerializer(serializers.ModelSerializer):
         fields = ['id', 'note', 'created_by', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class MeetingSerializer(serializers.ModelSerializer):
+class MeetingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     organizer = UserSerializer(read_only=True)
     attendees = UserSerializer(many=True, read_only=True)
     external_attendees = ContactSerializer(many=True, read_only=True)
@@ -1,13 +1,15 @@
-from rest_framework import generics, status
+from rest_framework import generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from core.mixins import QueryPlanMixin
+from core.notes import create_notes
+from core.views import PersonalFeedView
 from .models import Meeting, MeetingNote
 from .serializers import MeetingSerializer, MeetingNoteSerializer
 
-class MeetingListCreateView(generics.ListCreateAPIView):
+class MeetingListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Meeting.objects.all()
     serializer_class = MeetingSerializer
     permission_classes = [IsAuthenticated]
@@ -19,7 +21,7 @@ class MeetingListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(organizer=self.request.user)
 
-class MeetingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MeetingDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Meeting.objects.all()
     serializer_class = MeetingSerializer
     permission_classes = [IsAuthenticated]
@@ -27,19 +29,11 @@ class MeetingDetailView(generics.RetrieveUpdateDestroyAPIView):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_meeting_note(request, meeting_id):
-    try:
-        meeting = Meeting.objects.get(id=meeting_id)
-        serializer = MeetingNoteSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(meeting=meeting, created_by=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    except Meeting.DoesNotExist:
-        return Response({'error': 'Meeting not found'}, status=status.HTTP_404_NOT_FOUND)
+    return create_notes(request, Meeting, meeting_id, MeetingNoteSerializer, 'meeting')
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def my_meetings(request):
-    meetings = Meeting.objects.filter(attendees=request.user)
-    serializer = MeetingSerializer(meetings, many=True)
-    return Response(serializer.data)
+class MyMeetingsView(PersonalFeedView):
+    queryset = Meeting.objects.all()
+    serializer_class = MeetingSerializer
+    owner_field = 'attendees'
+    date_field = 'start_time'
+    ordering_fields = ['start_time', 'created_at']
@@ -1 +1,6 @@
 # This makes Python treat the directory as a package
+
+# Load the Celery app with Django so shared tasks use its configuration
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
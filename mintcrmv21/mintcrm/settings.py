@@ -21,9 +21,11 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'corsheaders',
     'django_filters',
+    'core',
     'accounts',
     'contacts',
     'cases',
@@ -34,6 +36,7 @@ INSTALLED_APPS = [
     'reports',
     'workflows',
     'portal',
+    'search',
 ]
 
 MIDDLEWARE = [
@@ -122,7 +125,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -146,14 +149,60 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-dashboard-counters': {
+        'task': 'reports.tasks.reconcile_dashboard_counters',
+        'schedule': 60 * 60,
+    },
+    'refresh-daily-rollups': {
+        'task': 'reports.tasks.refresh_daily_rollups',
+        'schedule': 15 * 60,
+    },
+    'dispatch-scheduled-reports': {
+        'task': 'reports.tasks.dispatch_scheduled_reports',
+        'schedule': 5 * 60,
+    },
+    'drain-email-outbox': {
+        'task': 'emails.tasks.drain_outbox',
+        'schedule': 60,
+    },
+    'find-duplicate-contacts': {
+        'task': 'contacts.tasks.find_all_contact_duplicates',
+        'schedule': 24 * 60 * 60,
+    },
+    'rebuild-daily-rollups': {
+        'task': 'reports.tasks.refresh_daily_rollups',
+        'schedule': 24 * 60 * 60,
+        'kwargs': {'full': True},
+    },
+}
+
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+    }
+}
+# Seconds list-view facet counts (?facets=) are reused for the same filters
+FACET_CACHE_TIMEOUT = config('FACET_CACHE_TIMEOUT', default=30, cast=int)
+# Seconds a process trusts its in-memory workflow trigger index before checking for changes
+WORKFLOW_INDEX_CHECK_INTERVAL = config('WORKFLOW_INDEX_CHECK_INTERVAL', default=5, cast=int)
+# Threads running one execution's independent workflow steps
+WORKFLOW_STEP_WORKERS = config('WORKFLOW_STEP_WORKERS', default=4, cast=int)
 
 # Email configuration
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='emails.backends.StreamingSMTPBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@mintcrm.com')
+# Upper bound on an outgoing message including base64-encoded attachments
+EMAIL_MAX_MESSAGE_SIZE = config('EMAIL_MAX_MESSAGE_SIZE', default=256 * 1024 * 1024, cast=int)
+# Queue outgoing email for the Celery outbox worker instead of sending inside the request
+EMAIL_OUTBOX_ENABLED = config('EMAIL_OUTBOX_ENABLED', default=True, cast=bool)
 
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User'
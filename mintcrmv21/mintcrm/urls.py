@@ -15,6 +15,8 @@ urlpatterns = [
     path('api/reports/', include('reports.urls')),
     path('api/workflows/', include('workflows.urls')),
     path('api/portal/', include('portal.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/tags/', include('core.urls')),
 ]
 
 if settings.DEBUG:
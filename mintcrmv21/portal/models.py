@@ -40,6 +40,11 @@ class PortalRequest(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='portalrequest_created_id_idx'),
+            models.Index(fields=['status', '-created_at'], name='portalreq_status_created_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='portalreq_assignee_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.subject} - {self.contact}"
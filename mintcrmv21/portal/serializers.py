@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import ClientPortalAccess, PortalRequest, PortalDocument
 from contacts.serializers import ContactSerializer
 from accounts.serializers import UserSerializer
 
-class ClientPortalAccessSerializer(serializers.ModelSerializer):
+class ClientPortalAccessSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     contact = ContactSerializer(read_only=True)
     
     class Meta:
@@ -11,7 +12,7 @@ class ClientPortalAccessSerializer(serializers.ModelSerializer):
         fields = ['id', 'contact', 'username', 'is_active', 'last_login', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class PortalDocumentSerializer(serializers.ModelSerializer):
+class PortalDocumentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -19,7 +20,7 @@ class PortalDocumentSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'document', 'is_public', 'uploaded_by', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
-class PortalRequestSerializer(serializers.ModelSerializer):
+class PortalRequestSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     contact = ContactSerializer(read_only=True)
     assigned_to = UserSerializer(read_only=True)
     requestType = serializers.CharField(write_only=True, required=False)
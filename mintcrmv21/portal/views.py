@@ -4,24 +4,33 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from core.batch import BatchDeleteMixin, BatchUpdateMixin
+from core.mixins import FacetMixin, QueryPlanMixin
 from .models import ClientPortalAccess, PortalRequest, PortalDocument
 from .serializers import ClientPortalAccessSerializer, PortalRequestSerializer, PortalDocumentSerializer
 
-class PortalRequestListCreateView(generics.ListCreateAPIView):
+class PortalRequestListCreateView(FacetMixin, QueryPlanMixin, generics.ListCreateAPIView):
     queryset = PortalRequest.objects.all()
     serializer_class = PortalRequestSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['request_type', 'status', 'assigned_to']
+    facet_fields = ['status', 'request_type']
     search_fields = ['subject', 'description']
     ordering_fields = ['created_at', 'updated_at']
 
-class PortalRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PortalRequestBatchUpdateView(BatchUpdateMixin, PortalRequestListCreateView):
+    batch_fields = ['status', 'assigned_to', 'response']
+
+class PortalRequestBatchDeleteView(BatchDeleteMixin, PortalRequestListCreateView):
+    pass
+
+class PortalRequestDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = PortalRequest.objects.all()
     serializer_class = PortalRequestSerializer
     permission_classes = [IsAuthenticated]
 
-class PortalDocumentListCreateView(generics.ListCreateAPIView):
+class PortalDocumentListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     queryset = PortalDocument.objects.all()
     serializer_class = PortalDocumentSerializer
     permission_classes = [IsAuthenticated]
@@ -33,7 +42,7 @@ class PortalDocumentListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(uploaded_by=self.request.user)
 
-class PortalDocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PortalDocumentDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = PortalDocument.objects.all()
     serializer_class = PortalDocumentSerializer
     permission_classes = [IsAuthenticated]
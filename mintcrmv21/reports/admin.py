@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Report, ScheduledReport
+from .models import DashboardCounter, Report, ReportJob, ScheduledReport
 
 class ScheduledReportInline(admin.TabularInline):
     model = ScheduledReport
@@ -17,3 +17,15 @@ class ReportAdmin(admin.ModelAdmin):
 class ScheduledReportAdmin(admin.ModelAdmin):
     list_display = ['report', 'frequency', 'is_active', 'last_sent', 'next_send']
     list_filter = ['frequency', 'is_active']
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['report', 'status', 'progress', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+@admin.register(DashboardCounter)
+class DashboardCounterAdmin(admin.ModelAdmin):
+    list_display = ['key', 'value', 'updated_at']
+    search_fields = ['key']
+    readonly_fields = ['updated_at']
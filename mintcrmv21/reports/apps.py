@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
+
+class ReportsConfig(AppConfig):
+    name = 'reports'
+
+    def ready(self):
+        from core.signals import bulk_saved
+        from .dashboard import TRACKED_MODELS
+        from .signals import (
+            remember_counted_values, update_counters_on_bulk_save, update_counters_on_delete,
+            update_counters_on_save,
+        )
+
+        for model in TRACKED_MODELS:
+            label = model._meta.label
+            pre_save.connect(remember_counted_values, sender=model, dispatch_uid=f'dashboard_pre_save_{label}')
+            post_save.connect(update_counters_on_save, sender=model, dispatch_uid=f'dashboard_save_{label}')
+            post_delete.connect(update_counters_on_delete, sender=model, dispatch_uid=f'dashboard_delete_{label}')
+            bulk_saved.connect(update_counters_on_bulk_save, sender=model, dispatch_uid=f'dashboard_bulk_{label}')
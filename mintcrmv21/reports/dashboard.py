@@ -0,0 +1,93 @@
+import datetime
+from collections import Counter
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from cases.models import Case
+from contacts.models import Contact
+from tasks.models import Task
+from .models import BillableHoursRollup, DashboardCounter, TaskThroughputRollup
+
+CACHE_KEY = 'reports:dashboard_stats'
+CACHE_TIMEOUT = 60 * 60
+
+# model -> (counter prefix, fields broken down into one counter per value)
+TRACKED_MODELS = {
+    Case: ('cases', ['status']),
+    Task: ('tasks', ['status', 'priority']),
+    Contact: ('contacts', []),
+}
+
+def counter_keys(model, values):
+    """``['cases', 'cases:status:open']`` for a case whose status is open."""
+    prefix, fields = TRACKED_MODELS[model]
+    return [prefix] + [f'{prefix}:{field}:{values[field]}' for field in fields]
+
+def apply_deltas(deltas):
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    for key, delta in deltas.items():
+        updated = DashboardCounter.objects.filter(key=key).update(
+            value=F('value') + delta, updated_at=timezone.now()
+        )
+        if not updated:
+            DashboardCounter.objects.get_or_create(key=key)
+            DashboardCounter.objects.filter(key=key).update(value=F('value') + delta)
+
+def recount():
+    """Rebuild every counter from a full count of the source tables."""
+    values = Counter()
+    for model, (prefix, fields) in TRACKED_MODELS.items():
+        values[prefix] = model._default_manager.count()
+        for field in fields:
+            for row in model._default_manager.order_by().values(field).annotate(count=Count('id')):
+                values[f'{prefix}:{field}:{row[field]}'] = row['count']
+
+    now = timezone.now()
+    with transaction.atomic():
+        DashboardCounter.objects.exclude(key__in=list(values)).delete()
+        DashboardCounter.objects.bulk_create(
+            [DashboardCounter(key=key, value=value, updated_at=now) for key, value in values.items()],
+            update_conflicts=True, unique_fields=['key'], update_fields=['value', 'updated_at'],
+        )
+    invalidate()
+    return len(values)
+
+def breakdown(counters, prefix, field):
+    start = f'{prefix}:{field}:'
+    return [
+        {field: key[len(start):], 'count': value}
+        for key, value in sorted(counters.items()) if key.startswith(start) and value
+    ]
+
+def build_stats():
+    counters = dict(DashboardCounter.objects.values_list('key', 'value'))
+    today = timezone.localdate()
+    billable_hours = BillableHoursRollup.objects.filter(day__gte=today.replace(day=1)).aggregate(total=Sum('hours'))
+    completed_tasks = TaskThroughputRollup.objects.filter(
+        day__gte=today - datetime.timedelta(days=today.weekday())
+    ).aggregate(total=Sum('completed'))
+    return {
+        'total_cases': counters.get('cases', 0),
+        'open_cases': counters.get('cases:status:open', 0),
+        'pending_tasks': counters.get('tasks:status:pending', 0),
+        'total_contacts': counters.get('contacts', 0),
+        'cases_by_status': breakdown(counters, 'cases', 'status'),
+        'tasks_by_priority': breakdown(counters, 'tasks', 'priority'),
+        'billable_hours_this_month': float(billable_hours['total'] or 0),
+        'tasks_completed_this_week': completed_tasks['total'] or 0,
+        'recent_cases': list(Case.objects.order_by('-created_at')[:5].values(
+            'id', 'case_number', 'title', 'status', 'created_at'
+        )),
+        'as_of': timezone.now(),
+    }
+
+def get_stats():
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        stats = build_stats()
+        cache.set(CACHE_KEY, stats, CACHE_TIMEOUT)
+    return stats
+
+def invalidate():
+    cache.delete(CACHE_KEY)
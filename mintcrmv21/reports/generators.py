@@ -0,0 +1,103 @@
+import datetime
+from collections import Counter, defaultdict
+from decimal import Decimal
+from django.db.models import Max, Min, Sum
+from django.utils.dateparse import parse_date
+from .models import BillableHoursRollup, CaseDailyRollup, TaskThroughputRollup
+
+WINDOW_DAYS = 90
+
+def report_period(report):
+    """``start_date``/``end_date`` from the report parameters; either may be None."""
+    parameters = report.parameters or {}
+    return parse_date(parameters.get('start_date') or ''), parse_date(parameters.get('end_date') or '')
+
+def day_windows(queryset, period, progress, window_days=WINDOW_DAYS):
+    """
+    Yield a rollup queryset narrowed to consecutive date windows within
+    ``period``, reporting the share of days covered after each window.
+    """
+    start, end = period
+    bounds = queryset.aggregate(first=Min('day'), last=Max('day'))
+    if bounds['first'] is None:
+        return
+    start = max(start or bounds['first'], bounds['first'])
+    end = min(end or bounds['last'], bounds['last'])
+    if start > end:
+        return
+    span = (end - start).days + 1
+    step = datetime.timedelta(days=window_days)
+    window_start = start
+    while window_start <= end:
+        window_end = min(window_start + step - datetime.timedelta(days=1), end)
+        yield queryset.filter(day__gte=window_start, day__lte=window_end)
+        progress(((window_end - start).days + 1) / span)
+        window_start = window_end + datetime.timedelta(days=1)
+
+def period_data(period):
+    return {'start_date': period[0] and period[0].isoformat(), 'end_date': period[1] and period[1].isoformat()}
+
+def scaled(progress, offset, share):
+    return lambda fraction: progress(offset + fraction * share)
+
+def case_summary(report, progress):
+    period = report_period(report)
+    by_status = Counter()
+    by_type = Counter()
+    for window in day_windows(CaseDailyRollup.objects.order_by(), period, progress):
+        for row in window.values('status', 'case_type').annotate(count=Sum('count')):
+            by_status[row['status']] += row['count']
+            by_type[row['case_type']] += row['count']
+    return {
+        'period': period_data(period),
+        'total_cases': sum(by_status.values()),
+        'cases_by_status': [{'status': key, 'count': count} for key, count in sorted(by_status.items())],
+        'cases_by_type': [{'case_type': key, 'count': count} for key, count in sorted(by_type.items())],
+    }
+
+def time_tracking(report, progress):
+    period = report_period(report)
+    hours = defaultdict(lambda: {'case_note': Decimal(0), 'task': Decimal(0)})
+    for window in day_windows(BillableHoursRollup.objects.order_by(), period, scaled(progress, 0, 0.5)):
+        for row in window.values('user__username', 'source').annotate(hours=Sum('hours')):
+            hours[row['user__username']][row['source']] += row['hours']
+
+    tasks = defaultdict(lambda: {'count': 0, 'completed': 0})
+    for window in day_windows(TaskThroughputRollup.objects.order_by(), period, scaled(progress, 0.5, 0.5)):
+        for row in window.values('user__username').annotate(created=Sum('created'), completed=Sum('completed')):
+            tasks[row['user__username']]['count'] += row['created']
+            tasks[row['user__username']]['completed'] += row['completed']
+
+    return {
+        'period': period_data(period),
+        'total_billable_hours': float(sum(row['case_note'] + row['task'] for row in hours.values())),
+        'hours_by_user': [
+            {
+                'username': username,
+                'case_note_hours': float(row['case_note']),
+                'task_hours': float(row['task']),
+                'total_hours': float(row['case_note'] + row['task']),
+            }
+            for username, row in sorted(hours.items())
+        ],
+        'tasks_by_user': [
+            {
+                'assigned_to__username': username,
+                'count': row['count'],
+                'completed': row['completed'],
+                'total_hours': float(hours[username]['task']) if username in hours else 0.0,
+            }
+            for username, row in sorted(tasks.items())
+        ],
+    }
+
+GENERATORS = {
+    'case_summary': case_summary,
+    'time_tracking': time_tracking,
+}
+
+def generate(report, progress):
+    generator = GENERATORS.get(report.report_type)
+    if generator is None:
+        return {'message': 'Report type not implemented yet'}
+    return generator(report, progress)
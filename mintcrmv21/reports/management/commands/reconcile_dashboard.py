@@ -0,0 +1,8 @@
+from django.core.management.base import BaseCommand
+from reports.dashboard import recount
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard counters from the source tables.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{recount()} counters rebuilt')
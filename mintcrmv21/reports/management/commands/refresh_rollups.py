@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from reports.dashboard import invalidate
+from reports.rollups import refresh_rollups
+
+class Command(BaseCommand):
+    help = 'Recompute the daily report rollups for days touched since the last run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every day instead')
+
+    def handle(self, *args, **options):
+        refreshed = refresh_rollups(full=options['full'])
+        invalidate()
+        for name, rows in refreshed.items():
+            self.stdout.write(f'{name}: {rows} rows')
@@ -15,17 +15,46 @@ class Report(models.Model):
     description = models.TextField(blank=True)
     report_type = models.CharField(max_length=50, choices=REPORT_TYPE_CHOICES)
     parameters = models.JSONField(default=dict, blank=True)
-    generated_data = models.JSONField(default=dict, blank=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='report_created_id_idx'),
+        ]
     
     def __str__(self):
         return self.name
 
+class ReportJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name='jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['report', '-created_at'], name='reportjob_report_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.report.name} - {self.status}"
+
 class ScheduledReport(models.Model):
     FREQUENCY_CHOICES = [
         ('daily', 'Daily'),
@@ -40,7 +69,78 @@ class ScheduledReport(models.Model):
     is_active = models.BooleanField(default=True)
     last_sent = models.DateTimeField(null=True, blank=True)
     next_send = models.DateTimeField()
+    # Recipients a failed send still owes the last run; the retry mails only them
+    retry_recipients = models.TextField(blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_send'], name='schedreport_due_idx', condition=models.Q(is_active=True)),
+        ]
+    
     def __str__(self):
         return f"{self.report.name} - {self.frequency}"
+
+class DashboardCounter(models.Model):
+    key = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+class CaseDailyRollup(models.Model):
+    day = models.DateField()
+    status = models.CharField(max_length=20)
+    case_type = models.CharField(max_length=50)
+    assigned_lawyer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['day'], name='caserollup_day_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.status}/{self.case_type}: {self.count}"
+
+class BillableHoursRollup(models.Model):
+    SOURCE_CHOICES = [
+        ('case_note', 'Case Note'),
+        ('task', 'Task'),
+    ]
+    
+    day = models.DateField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['day'], name='hoursrollup_day_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.user} {self.source}: {self.hours}"
+
+class TaskThroughputRollup(models.Model):
+    day = models.DateField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    created = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['day'], name='taskrollup_day_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.user}: {self.created} created, {self.completed} completed"
+
+class RollupState(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
@@ -0,0 +1,129 @@
+import datetime
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from cases.models import Case, CaseNote
+from tasks.models import Task
+from .models import BillableHoursRollup, CaseDailyRollup, RollupState, TaskThroughputRollup
+
+STATE_NAME = 'daily'
+# Re-read a little before the watermark so rows committed late by slow transactions aren't missed
+WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+
+def by_day(queryset, field, days=None):
+    """Annotate ``day`` from ``field`` and keep only rows that fall on ``days``."""
+    queryset = queryset.order_by().annotate(day=TruncDate(field))
+    if days is None:
+        return queryset
+    # The range lets the source table's index do the work; day__in drops gaps
+    start = timezone.make_aware(datetime.datetime.combine(min(days), datetime.time.min))
+    end = timezone.make_aware(datetime.datetime.combine(max(days) + datetime.timedelta(days=1), datetime.time.min))
+    return queryset.filter(**{f'{field}__gte': start, f'{field}__lt': end, 'day__in': days})
+
+def days_of(queryset, *fields):
+    days = set()
+    for field in fields:
+        days.update(
+            queryset.filter(**{f'{field}__isnull': False}).order_by()
+            .annotate(day=TruncDate(field)).values_list('day', flat=True).distinct()
+        )
+    return days
+
+class DailyRollup:
+    model = None
+
+    def touched_days(self, since):
+        raise NotImplementedError
+
+    def build(self, days):
+        raise NotImplementedError
+
+    def refresh(self, days=None):
+        """Replace the rollup rows for ``days`` (every day when None)."""
+        rows = self.model.objects.all() if days is None else self.model.objects.filter(day__in=days)
+        rows.delete()
+        return len(self.model.objects.bulk_create(self.build(days), batch_size=1000))
+
+class CaseRollupBuilder(DailyRollup):
+    model = CaseDailyRollup
+
+    def touched_days(self, since):
+        return days_of(Case.objects.filter(updated_at__gte=since), 'created_at')
+
+    def build(self, days):
+        rows = by_day(Case.objects.all(), 'created_at', days).values(
+            'day', 'status', 'case_type', 'assigned_lawyer'
+        ).annotate(count=Count('id'))
+        return [
+            CaseDailyRollup(
+                day=row['day'], status=row['status'], case_type=row['case_type'],
+                assigned_lawyer_id=row['assigned_lawyer'], count=row['count'],
+            )
+            for row in rows
+        ]
+
+class BillableHoursRollupBuilder(DailyRollup):
+    model = BillableHoursRollup
+    notes = CaseNote.objects.filter(is_billable=True, hours_spent__isnull=False)
+    # Task hours are booked on the day the task is completed, or the day it
+    # was created while it is still open, so every logged hour is counted
+    tasks = Task.objects.filter(actual_hours__isnull=False).annotate(booked_at=Coalesce('completed_at', 'created_at'))
+
+    def touched_days(self, since):
+        # Both days, so hours leave the creation day when a task is completed
+        return days_of(self.notes.filter(created_at__gte=since), 'created_at') | \
+            days_of(self.tasks.filter(updated_at__gte=since), 'created_at', 'completed_at')
+
+    def build(self, days):
+        notes = by_day(self.notes, 'created_at', days).values('day', 'created_by').annotate(hours=Sum('hours_spent'))
+        tasks = by_day(self.tasks, 'booked_at', days).values('day', 'assigned_to').annotate(hours=Sum('actual_hours'))
+        return [
+            BillableHoursRollup(day=row['day'], user_id=row['created_by'], source='case_note', hours=row['hours'])
+            for row in notes
+        ] + [
+            BillableHoursRollup(day=row['day'], user_id=row['assigned_to'], source='task', hours=row['hours'])
+            for row in tasks
+        ]
+
+class TaskThroughputRollupBuilder(DailyRollup):
+    model = TaskThroughputRollup
+
+    def touched_days(self, since):
+        return days_of(Task.objects.filter(updated_at__gte=since), 'created_at', 'completed_at')
+
+    def build(self, days):
+        counts = defaultdict(lambda: {'created': 0, 'completed': 0})
+        created = by_day(Task.objects.all(), 'created_at', days).values('day', 'assigned_to').annotate(count=Count('id'))
+        for row in created:
+            counts[row['day'], row['assigned_to']]['created'] = row['count']
+        completed = by_day(Task.objects.filter(completed_at__isnull=False), 'completed_at', days).values(
+            'day', 'assigned_to'
+        ).annotate(count=Count('id'))
+        for row in completed:
+            counts[row['day'], row['assigned_to']]['completed'] = row['count']
+        return [
+            TaskThroughputRollup(day=day, user_id=user_id, **values)
+            for (day, user_id), values in counts.items()
+        ]
+
+ROLLUPS = [CaseRollupBuilder(), BillableHoursRollupBuilder(), TaskThroughputRollupBuilder()]
+
+def refresh_rollups(full=False):
+    """
+    Recompute the daily rollups for every day touched since the last run,
+    or rebuild them completely with ``full``. Deletions and rows that move
+    to another day are only picked up by a full rebuild.
+    """
+    started = timezone.now()
+    refreshed = {}
+    with transaction.atomic():
+        state, _ = RollupState.objects.select_for_update().get_or_create(name=STATE_NAME)
+        since = None if full or state.watermark is None else state.watermark - WATERMARK_OVERLAP
+        for rollup in ROLLUPS:
+            days = None if since is None else rollup.touched_days(since)
+            refreshed[rollup.model._meta.model_name] = rollup.refresh(days) if days is None or days else 0
+        state.watermark = started
+        state.save()
+    return refreshed
@@ -0,0 +1,143 @@
+import calendar
+import datetime
+import json
+import logging
+from collections import defaultdict
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from .generators import generate
+from .models import ReportJob, ScheduledReport
+from .rollups import refresh_rollups
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+FREQUENCY_MONTHS = {'monthly': 1, 'quarterly': 3}
+FREQUENCY_DAYS = {'daily': 1, 'weekly': 7}
+
+def add_months(value, months):
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+def advance(next_send, frequency, now):
+    """The first send time after ``now``; missed runs are skipped, not replayed."""
+    while next_send <= now:
+        if frequency in FREQUENCY_MONTHS:
+            next_send = add_months(next_send, FREQUENCY_MONTHS[frequency])
+        else:
+            next_send += datetime.timedelta(days=FREQUENCY_DAYS[frequency])
+    return next_send
+
+def render(report, now):
+    result = generate(report, lambda fraction: None)
+    ReportJob.objects.create(
+        report=report, status='completed', progress=100, result=result,
+        started_at=now, finished_at=timezone.now(),
+    )
+    subject = f"{report.name} - {timezone.localtime(now):%Y-%m-%d}"
+    body = json.dumps(result, indent=2, cls=DjangoJSONEncoder)
+    return subject, body, f"{slugify(report.name) or 'report'}.json"
+
+def recipients_for(schedule):
+    """Everyone on the schedule, or only those a failed run still owes."""
+    recipients = schedule.retry_recipients or schedule.recipients
+    return [recipient.strip() for recipient in recipients.split(',') if recipient.strip()]
+
+def build_message(schedule, rendered, recipient, connection):
+    subject, body, filename = rendered
+    message = EmailMessage(
+        subject=subject,
+        body=f"{schedule.report.description}\n\n{body}".strip(),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+        connection=connection,
+    )
+    message.attach(filename, body, 'application/json')
+    return message
+
+def send_schedule(schedule, rendered, connection):
+    """Mail each recipient separately; returns the addresses that failed."""
+    failed = []
+    for recipient in recipients_for(schedule):
+        try:
+            connection.send_messages([build_message(schedule, rendered, recipient, connection)])
+        except Exception:
+            logger.exception('Sending scheduled report %s to %s failed', schedule.pk, recipient)
+            failed.append(recipient)
+            # The session may be unusable after an error; start a fresh one for the rest
+            connection.close()
+            try:
+                connection.open()
+            except Exception:
+                pass
+    return failed
+
+def claim_due(now, batch_size):
+    """
+    Lock a batch of due schedules with ``SELECT ... FOR UPDATE SKIP LOCKED``
+    and move each one to its next run before anything is sent, so other
+    workers pass over them once the claim commits. ``due_at`` keeps the
+    original time for putting a failed send back.
+    """
+    with transaction.atomic():
+        due = list(
+            ScheduledReport.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('report')
+            .filter(is_active=True, next_send__lte=now)
+            .order_by('next_send')[:batch_size]
+        )
+        if not due:
+            return []
+        for schedule in due:
+            schedule.due_at = schedule.next_send
+            schedule.next_send = advance(schedule.next_send, schedule.frequency, now)
+        ScheduledReport.objects.bulk_update(due, ['next_send'])
+    return due
+
+def dispatch_due_reports(now=None, batch_size=BATCH_SIZE):
+    """
+    Send one batch of due schedules and return how many went out. Each
+    report is rendered once per batch, every message goes out over one SMTP
+    connection, and each schedule's outcome is saved as soon as it is known.
+    A recipient whose send fails is kept for the retry; the others are not
+    mailed again.
+    """
+    now = now or timezone.now()
+    if not ScheduledReport.objects.filter(is_active=True, next_send__lte=now).exists():
+        return 0
+    # Outside the claim, so the schedule row locks are not held while rollups are recomputed
+    refresh_rollups()
+    due = claim_due(now, batch_size)
+    if not due:
+        return 0
+    schedules_by_report = defaultdict(list)
+    for schedule in due:
+        schedules_by_report[schedule.report_id].append(schedule)
+
+    sent = 0
+    with get_connection() as connection:
+        for schedules in schedules_by_report.values():
+            try:
+                rendered = render(schedules[0].report, now)
+            except Exception:
+                # The schedules already moved on, so a broken report skips this run instead of blocking the queue
+                logger.exception('Rendering scheduled report %s failed', schedules[0].report_id)
+                continue
+            for schedule in schedules:
+                failed = send_schedule(schedule, rendered, connection)
+                if failed:
+                    # Due again for the failed addresses only, so nobody gets the report twice
+                    ScheduledReport.objects.filter(pk=schedule.pk).update(
+                        next_send=schedule.due_at, retry_recipients=', '.join(failed),
+                    )
+                    continue
+                ScheduledReport.objects.filter(pk=schedule.pk).update(last_sent=now, retry_recipients='')
+                sent += 1
+    return sent
@@ -1,14 +1,15 @@
 from rest_framework import serializers
-from .models import Report, ScheduledReport
+from core.serializers import DynamicFieldsMixin
+from .models import Report, ReportJob, ScheduledReport
 from accounts.serializers import UserSerializer
 
-class ScheduledReportSerializer(serializers.ModelSerializer):
+class ScheduledReportSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ScheduledReport
         fields = ['id', 'frequency', 'recipients', 'is_active', 'last_sent', 'next_send', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     scheduled_reports = ScheduledReportSerializer(many=True, read_only=True)
     
@@ -16,7 +17,21 @@ class ReportSerializer(serializers.ModelSerializer):
         model = Report
         fields = [
             'id', 'name', 'description', 'report_type', 'parameters',
-            'generated_data', 'created_by', 'created_at', 'updated_at',
-            'scheduled_reports'
+            'created_by', 'created_at', 'updated_at', 'scheduled_reports'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+class ReportJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'report', 'status', 'progress', 'result', 'error',
+            'requested_by', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+class ReportJobSummarySerializer(ReportJobSerializer):
+    """Job listing without ``result``, which can be large; the detail view returns it."""
+    class Meta(ReportJobSerializer.Meta):
+        fields = [field for field in ReportJobSerializer.Meta.fields if field != 'result']
+        read_only_fields = fields
@@ -0,0 +1,50 @@
+from collections import Counter
+from django.db import transaction
+from cases.models import Case
+from .dashboard import TRACKED_MODELS, apply_deltas, counter_keys, invalidate
+
+def record_change(sender, deltas):
+    apply_deltas(deltas)
+    # recent_cases is part of the cached payload too
+    if any(deltas.values()) or sender is Case:
+        transaction.on_commit(invalidate)
+
+def remember_counted_values(sender, instance, raw=False, **kwargs):
+    prefix, fields = TRACKED_MODELS[sender]
+    instance._dashboard_counted = None
+    if raw or instance._state.adding or not fields:
+        return
+    instance._dashboard_counted = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    prefix, fields = TRACKED_MODELS[sender]
+    current = {field: getattr(instance, field) for field in fields}
+    deltas = Counter(counter_keys(sender, current))
+    if not created:
+        previous = getattr(instance, '_dashboard_counted', None)
+        if previous is not None:
+            deltas.subtract(counter_keys(sender, previous))
+        else:
+            deltas.clear()
+    record_change(sender, deltas)
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    prefix, fields = TRACKED_MODELS[sender]
+    current = {field: getattr(instance, field) for field in fields}
+    record_change(sender, {key: -1 for key in counter_keys(sender, current)})
+
+def update_counters_on_bulk_save(sender, instances, created=False, previous=None, **kwargs):
+    # Updates sent without their previous values are left to the periodic recount
+    if not created and previous is None:
+        return
+    prefix, fields = TRACKED_MODELS[sender]
+    deltas = Counter()
+    for instance in instances:
+        current = {field: getattr(instance, field) for field in fields}
+        deltas.update(counter_keys(sender, current))
+        if not created:
+            before = {field: previous.get(instance.pk, {}).get(field, value) for field, value in current.items()}
+            deltas.subtract(counter_keys(sender, before))
+    record_change(sender, deltas)
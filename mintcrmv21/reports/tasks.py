@@ -0,0 +1,56 @@
+import logging
+from celery import shared_task
+from django.utils import timezone
+from .dashboard import invalidate, recount
+from .generators import generate
+from .models import ReportJob
+from .rollups import refresh_rollups
+from .scheduling import BATCH_SIZE, dispatch_due_reports
+
+logger = logging.getLogger(__name__)
+
+@shared_task
+def reconcile_dashboard_counters():
+    return recount()
+
+@shared_task
+def refresh_daily_rollups(full=False):
+    refreshed = refresh_rollups(full=full)
+    invalidate()
+    return refreshed
+
+@shared_task
+def run_report_job(job_id):
+    jobs = ReportJob.objects.filter(pk=job_id)
+    if not jobs.filter(status='queued').update(status='running', started_at=timezone.now(), progress=0):
+        # Redelivered task; the job already ran or is running
+        return jobs.values_list('status', flat=True).first()
+    job = ReportJob.objects.select_related('report').get(pk=job_id)
+
+    last = [0]
+    def progress(fraction):
+        percent = min(int(fraction * 100), 99)
+        if percent > last[0]:
+            last[0] = percent
+            jobs.update(progress=percent)
+
+    try:
+        # Bring the rollups up to date; only days touched since the last run are recomputed
+        refresh_rollups()
+        result = generate(job.report, progress)
+    except Exception as exc:
+        logger.exception('Report job %s failed', job_id)
+        jobs.update(status='failed', error=str(exc), finished_at=timezone.now())
+        return 'failed'
+    jobs.update(status='completed', progress=100, result=result, finished_at=timezone.now())
+    return 'completed'
+
+@shared_task
+def dispatch_scheduled_reports():
+    total = 0
+    while True:
+        sent = dispatch_due_reports()
+        total += sent
+        # A short batch means nothing else is due (or the rest failed and will be retried)
+        if sent < BATCH_SIZE:
+            return total
@@ -5,5 +5,7 @@ urlpatterns = [
     path('', views.ReportListCreateView.as_view(), name='report-list'),
     path('<int:pk>/', views.ReportDetailView.as_view(), name='report-detail'),
     path('<int:report_id>/generate/', views.generate_report, name='generate-report'),
+    path('<int:report_id>/jobs/', views.ReportJobListView.as_view(), name='report-job-list'),
+    path('jobs/<int:pk>/', views.ReportJobDetailView.as_view(), name='report-job-detail'),
     path('dashboard-stats/', views.dashboard_stats, name='dashboard-stats'),
 ]
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['entity_type', 'entity_id', 'title', 'is_restricted', 'updated_at']
+    list_filter = ['entity_type', 'is_restricted']
+    search_fields = ['title', 'summary']
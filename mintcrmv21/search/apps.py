@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+class SearchConfig(AppConfig):
+    name = 'search'
+
+    def ready(self):
+        from core.signals import bulk_saved
+        from .indexers import INDEXERS
+        from .signals import entities_changed, entity_changed
+
+        for model in INDEXERS:
+            post_save.connect(entity_changed, sender=model, dispatch_uid=f'search_index_save_{model._meta.label}')
+            post_delete.connect(entity_changed, sender=model, dispatch_uid=f'search_index_delete_{model._meta.label}')
+            bulk_saved.connect(entities_changed, sender=model, dispatch_uid=f'search_index_bulk_{model._meta.label}')
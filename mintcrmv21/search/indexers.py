@@ -0,0 +1,55 @@
+from cases.models import Case
+from contacts.models import Contact
+from documents.models import Document
+from emails.models import Email
+from tasks.models import Task
+
+def join(*parts):
+    return ' '.join(str(part) for part in parts if part)
+
+def index_contact(contact):
+    return {
+        'title': str(contact) or contact.email,
+        'summary': contact.email,
+        'content': join(contact.title, contact.phone, contact.mobile, contact.city, contact.tags, contact.notes),
+    }
+
+def index_case(case):
+    return {
+        'title': f"{case.case_number} - {case.title}",
+        'summary': case.get_status_display(),
+        'content': join(case.description, case.court, case.judge, case.opposing_counsel),
+    }
+
+def index_task(task):
+    return {
+        'title': task.title,
+        'summary': f"{task.get_status_display()} - {task.get_priority_display()}",
+        'content': task.description,
+        'allowed_user_ids': [task.assigned_to_id, task.created_by_id],
+    }
+
+def index_document(document):
+    return {
+        'title': document.title,
+        'summary': document.get_document_type_display(),
+        'content': join(document.description, document.tags),
+        'is_restricted': document.is_confidential,
+        'allowed_user_ids': [document.uploaded_by_id],
+    }
+
+def index_email(email):
+    return {
+        'title': email.subject,
+        'summary': email.from_email,
+        'content': join(email.to_emails, email.body),
+    }
+
+# model -> (entity_type, function returning SearchDocument fields)
+INDEXERS = {
+    Contact: ('contact', index_contact),
+    Case: ('case', index_case),
+    Task: ('task', index_task),
+    Document: ('document', index_document),
+    Email: ('email', index_email),
+}
@@ -0,0 +1,61 @@
+import threading
+from collections import defaultdict
+from django.db import transaction
+from core.search import update_search_vectors
+from .indexers import INDEXERS
+from .models import SearchDocument
+
+DOCUMENT_FIELDS = ['title', 'summary', 'content', 'is_restricted', 'allowed_user_ids', 'updated_at']
+
+_pending = threading.local()
+
+def index_instances(model, pks):
+    """
+    Bring the search documents for ``pks`` in line with the source table:
+    upsert the rows that exist and drop the ones that are gone.
+    """
+    entity_type, indexer = INDEXERS[model]
+    documents = []
+    for instance in model._default_manager.filter(pk__in=pks):
+        fields = {'is_restricted': False, 'allowed_user_ids': [], **indexer(instance)}
+        fields['title'] = fields['title'][:300]
+        fields['summary'] = fields['summary'][:300]
+        fields['allowed_user_ids'] = sorted({pk for pk in fields['allowed_user_ids'] if pk})
+        documents.append(SearchDocument(
+            entity_type=entity_type, entity_id=instance.pk,
+            updated_at=getattr(instance, 'updated_at', None) or getattr(instance, 'created_at'),
+            **fields
+        ))
+
+    with transaction.atomic():
+        SearchDocument.objects.bulk_create(
+            documents, update_conflicts=True,
+            unique_fields=['entity_type', 'entity_id'], update_fields=DOCUMENT_FIELDS,
+        )
+        found = {document.entity_id for document in documents}
+        SearchDocument.objects.filter(entity_type=entity_type, entity_id__in=set(pks) - found).delete()
+        update_search_vectors(SearchDocument.objects.filter(entity_type=entity_type, entity_id__in=found))
+    return len(documents)
+
+def schedule(model, pk):
+    """
+    Queue a re-index for after the current transaction commits, so a burst
+    of saves inside one transaction is indexed in a single batch per model.
+    """
+    connection = transaction.get_connection()
+    fresh = not any(callback[1] is flush for callback in connection.run_on_commit)
+    if fresh:
+        # Anything still pending belongs to a transaction that rolled back
+        _pending.items = defaultdict(set)
+    _pending.items[model].add(pk)
+    if fresh:
+        # Outside a transaction this flushes right away
+        transaction.on_commit(flush)
+
+def flush():
+    items = getattr(_pending, 'items', None)
+    if not items:
+        return
+    _pending.items = defaultdict(set)
+    for model, pks in items.items():
+        index_instances(model, pks)
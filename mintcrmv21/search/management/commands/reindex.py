@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from search.indexers import INDEXERS
+from search.indexing import index_instances
+from search.models import SearchDocument
+
+class Command(BaseCommand):
+    help = 'Rebuild the unified search index from the source tables in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', action='append', dest='types', help='Entity type to rebuild (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        types = options['types']
+        known = {entity_type for entity_type, indexer in INDEXERS.values()}
+        if types and not set(types) <= known:
+            raise CommandError(f"Unknown type; choose from {', '.join(sorted(known))}")
+
+        batch_size = options['batch_size']
+        for model, (entity_type, indexer) in INDEXERS.items():
+            if types and entity_type not in types:
+                continue
+            pks = model._default_manager.order_by('pk').values_list('pk', flat=True)
+            indexed = 0
+            last_pk = 0
+            while True:
+                batch = list(pks.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                indexed += index_instances(model, batch)
+                last_pk = batch[-1]
+            removed, _ = SearchDocument.objects.filter(entity_type=entity_type).exclude(
+                entity_id__in=model._default_manager.values('pk')
+            ).delete()
+            self.stdout.write(f'{entity_type}: {indexed} indexed, {removed} removed')
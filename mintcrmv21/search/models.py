@@ -0,0 +1,35 @@
+from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+
+class SearchDocument(models.Model):
+    ENTITY_TYPE_CHOICES = [
+        ('contact', 'Contact'),
+        ('case', 'Case'),
+        ('task', 'Task'),
+        ('document', 'Document'),
+        ('email', 'Email'),
+    ]
+    
+    SEARCH_FIELDS = [('title', 'A'), ('summary', 'B'), ('content', 'C')]
+    
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPE_CHOICES)
+    entity_id = models.BigIntegerField()
+    title = models.CharField(max_length=300)
+    summary = models.CharField(max_length=300, blank=True)
+    content = models.TextField(blank=True)
+    is_restricted = models.BooleanField(default=False)
+    allowed_user_ids = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField()
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'entity_id'], name='searchdoc_entity_unique'),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='searchdoc_vector_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.entity_type} {self.entity_id}: {self.title}"
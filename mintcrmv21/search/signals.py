@@ -0,0 +1,8 @@
+from .indexing import schedule
+
+def entity_changed(sender, instance, **kwargs):
+    schedule(sender, instance.pk)
+
+def entities_changed(sender, instances, **kwargs):
+    for instance in instances:
+        schedule(sender, instance.pk)
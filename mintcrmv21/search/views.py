@@ -0,0 +1,68 @@
+from django.db import connections
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.search import build_search_query, is_postgres, search_rank
+from .models import SearchDocument
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+def visible_documents(user):
+    queryset = SearchDocument.objects.all()
+    if user.role in ['admin', 'lawyer']:
+        return queryset
+    if connections[queryset.db].features.supports_json_field_contains:
+        return queryset.filter(Q(is_restricted=False) | Q(allowed_user_ids__contains=[user.id]))
+    # SQLite can't search inside JSON arrays; match the restricted rows here instead
+    allowed = [
+        pk for pk, user_ids in queryset.filter(is_restricted=True).values_list('pk', 'allowed_user_ids')
+        if user.id in user_ids
+    ]
+    return queryset.filter(Q(is_restricted=False) | Q(pk__in=allowed))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def global_search(request):
+    """
+    Search every entity type at once and return the best ``?limit=`` hits
+    per type, ranked and grouped in a single query against the index table.
+    """
+    terms = request.query_params.get('q', '').split()
+    if not terms:
+        return Response({'error': 'q is required'}, status=400)
+    try:
+        limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+
+    queryset = visible_documents(request.user)
+    types = [t for t in request.query_params.get('types', '').split(',') if t]
+    if types:
+        queryset = queryset.filter(entity_type__in=types)
+
+    if is_postgres(queryset):
+        query = build_search_query(terms)
+        queryset = queryset.filter(search_vector=query).annotate(rank=search_rank(query))
+        best_first = [F('rank').desc(), F('updated_at').desc()]
+    else:
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+        best_first = [F('updated_at').desc()]
+
+    hits = queryset.annotate(
+        position=Window(RowNumber(), partition_by=[F('entity_type')], order_by=best_first),
+    ).filter(position__lte=limit).order_by('entity_type', 'position')
+
+    results = {}
+    for hit in hits:
+        results.setdefault(hit.entity_type, []).append({
+            'id': hit.entity_id,
+            'title': hit.title,
+            'summary': hit.summary,
+            'rank': getattr(hit, 'rank', None),
+            'updated_at': hit.updated_at,
+        })
+    return Response({'query': ' '.join(terms), 'results': results})
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from cases.models import Case
 from contacts.models import Contact
 
@@ -35,6 +36,15 @@ class Task(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='task_created_id_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+            models.Index(fields=['assigned_to', 'due_date'], name='task_assignee_due_idx'),
+            models.Index(fields=['case', 'status'], name='task_case_status_idx'),
+            models.Index(fields=['status', 'priority'], name='task_status_priority_idx'),
+            models.Index(fields=['due_date', 'id'], name='task_due_id_idx'),
+            models.Index(fields=['updated_at'], name='task_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -43,7 +53,7 @@ class TaskComment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments')
     comment = models.TextField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
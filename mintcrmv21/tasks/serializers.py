@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Task, TaskComment
 from accounts.serializers import UserSerializer
 from cases.serializers import CaseSerializer
@@ -7,7 +8,7 @@ from cases.models import Case
 from contacts.models import Contact
 from accounts.models import User
 
-class TaskCommentSerializer(serializers.ModelSerializer):
+class TaskCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     
     class Meta:
@@ -15,7 +16,7 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'comment', 'created_by', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     assigned_to = UserSerializer(read_only=True)
     case = CaseSerializer(read_only=True)
     contact = ContactSerializer(read_only=True)
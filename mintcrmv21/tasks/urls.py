@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('', views.TaskListCreateView.as_view(), name='task-list'),
     path('<int:pk>/', views.TaskDetailView.as_view(), name='task-detail'),
+    path('bulk-update/', views.TaskBatchUpdateView.as_view(), name='task-bulk-update'),
+    path('bulk-delete/', views.TaskBatchDeleteView.as_view(), name='task-bulk-delete'),
+    path('export/', views.TaskExportView.as_view(), name='task-export'),
     path('<int:task_id>/comments/', views.add_task_comment, name='add-task-comment'),
-    path('my-tasks/', views.my_tasks, name='my-tasks'),
+    path('my-tasks/', views.MyTasksView.as_view(), name='my-tasks'),
 ]
@@ -1,25 +1,53 @@
-from rest_framework import generics, status
+from rest_framework import generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.utils import timezone
+from core.batch import BatchDeleteMixin, BatchUpdateMixin
+from core.mixins import FacetMixin, QueryPlanMixin
+from core.notes import create_notes
+from core.views import ExportMixin, PersonalFeedView
 from .models import Task, TaskComment
 from .serializers import TaskSerializer, TaskCommentSerializer
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(FacetMixin, QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'priority', 'assigned_to', 'case']
+    facet_fields = ['status', 'priority']
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'due_date', 'priority']
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskExportView(ExportMixin, TaskListCreateView):
+    export_filename = 'tasks'
+    export_fields = [
+        'id', 'title', 'status', 'priority', 'assigned_to__username', 'case_id',
+        'case__case_number', 'contact_id', 'due_date', 'completed_at', 'estimated_hours',
+        'actual_hours', 'created_at', 'updated_at'
+    ]
+
+class TaskBatchUpdateView(BatchUpdateMixin, TaskListCreateView):
+    batch_fields = [
+        'title', 'description', 'status', 'priority', 'assigned_to', 'case', 'contact',
+        'due_date', 'completed_at', 'estimated_hours', 'actual_hours'
+    ]
+    
+    def extra_changes(self, row, values):
+        # Throughput reports count a task on the day it was completed
+        if values.get('status') == 'completed' and 'completed_at' not in values and row.completed_at is None:
+            return {'completed_at': timezone.now()}
+        return {}
+
+class TaskBatchDeleteView(BatchDeleteMixin, TaskListCreateView):
+    pass
+
+class TaskDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
@@ -27,19 +55,11 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_task_comment(request, task_id):
-    try:
-        task = Task.objects.get(id=task_id)
-        serializer = TaskCommentSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(task=task, created_by=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    except Task.DoesNotExist:
-        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+    return create_notes(request, Task, task_id, TaskCommentSerializer, 'task')
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def my_tasks(request):
-    tasks = Task.objects.filter(assigned_to=request.user)
-    serializer = TaskSerializer(tasks, many=True)
-    return Response(serializer.data)
+class MyTasksView(PersonalFeedView):
+    queryset = Task.objects.all()
+    serializer_class = TaskSerializer
+    owner_field = 'assigned_to'
+    date_field = 'due_date'
+    ordering_fields = ['created_at', 'due_date', 'priority']
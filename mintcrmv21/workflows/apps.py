@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
+
+class WorkflowsConfig(AppConfig):
+    name = 'workflows'
+
+    def ready(self):
+        from core.signals import bulk_saved
+        from .engine import EVENT_SOURCES, has_status, model_saved, models_bulk_saved, remember_status, workflows_changed
+        from .models import Workflow
+
+        for model, prefix in EVENT_SOURCES.items():
+            if has_status(model):
+                pre_save.connect(remember_status, sender=model, dispatch_uid=f'workflow_status_{prefix}')
+            post_save.connect(model_saved, sender=model, dispatch_uid=f'workflow_event_{prefix}')
+            bulk_saved.connect(models_bulk_saved, sender=model, dispatch_uid=f'workflow_bulk_event_{prefix}')
+        post_save.connect(workflows_changed, sender=Workflow, dispatch_uid='workflow_index_save')
+        post_delete.connect(workflows_changed, sender=Workflow, dispatch_uid='workflow_index_delete')
@@ -0,0 +1,576 @@
+import datetime
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from cases.models import Case
+from contacts.models import Contact
+from core.signals import bulk_saved
+from documents.models import Document
+from meetings.models import Meeting
+from portal.models import PortalRequest
+from tasks.models import Task
+from .models import Workflow, WorkflowExecution
+
+logger = logging.getLogger(__name__)
+
+# Models whose saves raise events, and the prefix of their event names
+EVENT_SOURCES = {
+    Case: 'case',
+    Contact: 'contact',
+    Task: 'task',
+    Document: 'document',
+    Meeting: 'meeting',
+    PortalRequest: 'portal_request',
+}
+ASSIGNEE_FIELDS = ['assigned_to', 'assigned_lawyer']
+# Events per Celery message, so a bulk import doesn't produce one huge message
+DISPATCH_BATCH_SIZE = 500
+
+def has_status(model):
+    return any(field.name == 'status' for field in model._meta.concrete_fields)
+
+EVENTS = sorted(
+    f'{prefix}.{kind}'
+    for model, prefix in EVENT_SOURCES.items()
+    for kind in ['created', 'updated', 'status_changed']
+    if kind != 'status_changed' or has_status(model)
+)
+
+class StepError(Exception):
+    pass
+
+class TriggerIndex:
+    """
+    Active workflow ids by ``trigger_event``, held in process memory so that
+    matching an event is a dict lookup. Saving or deleting a workflow bumps a
+    version in the shared cache; other processes pick the change up within
+    ``WORKFLOW_INDEX_CHECK_INTERVAL`` seconds.
+    """
+    version_key = 'workflows:trigger-index-version'
+
+    def __init__(self):
+        self.workflows = None
+        self.version = None
+        self.checked_at = 0.0
+
+    def get(self, event):
+        now = time.monotonic()
+        if self.workflows is None or now - self.checked_at > settings.WORKFLOW_INDEX_CHECK_INTERVAL:
+            self.refresh(now)
+        return self.workflows.get(event, ())
+
+    def refresh(self, now):
+        version = cache.get(self.version_key, 0)
+        if self.workflows is None or version != self.version:
+            workflows = defaultdict(list)
+            for pk, event in Workflow.objects.filter(is_active=True).order_by('id').values_list('id', 'trigger_event'):
+                workflows[event].append(pk)
+            self.workflows = {event: tuple(ids) for event, ids in workflows.items()}
+            self.version = version
+        self.checked_at = now
+
+    def invalidate(self):
+        self.workflows = None
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, None)
+
+index = TriggerIndex()
+_state = threading.local()
+
+@contextmanager
+def suppress_events():
+    """Drop events raised inside the block, so a workflow's own steps cannot trigger workflows."""
+    _state.suppressed = getattr(_state, 'suppressed', 0) + 1
+    try:
+        yield
+    finally:
+        _state.suppressed -= 1
+
+def emit(event, model, pk, **data):
+    """
+    Queue ``event`` for the workflows listening to it. Nothing is dispatched
+    until the transaction commits, and then in one Celery message per
+    transaction; events nobody listens to cost a dict lookup.
+    """
+    if getattr(_state, 'suppressed', 0):
+        return
+    workflows = index.get(event)
+    if not workflows:
+        return
+    connection = transaction.get_connection()
+    fresh = not any(callback[1] is flush for callback in connection.run_on_commit)
+    if fresh:
+        # Anything still pending belongs to a transaction that rolled back
+        _state.pending = []
+    _state.pending.append({
+        'event': event,
+        'model': model._meta.label_lower,
+        'object_id': pk,
+        'workflows': list(workflows),
+        'occurred_at': timezone.now().isoformat(),
+        **data,
+    })
+    if fresh:
+        # Outside a transaction this flushes right away
+        transaction.on_commit(flush)
+
+def flush():
+    from .tasks import run_workflows
+    events = getattr(_state, 'pending', None)
+    if not events:
+        return
+    _state.pending = []
+    for start in range(0, len(events), DISPATCH_BATCH_SIZE):
+        run_workflows.delay(events[start:start + DISPATCH_BATCH_SIZE])
+
+def start_executions(events):
+    """Record a pending execution per (event, still-active workflow) and queue each to run."""
+    wanted = {pk for event in events for pk in event['workflows']}
+    active = set(Workflow.objects.filter(pk__in=wanted, is_active=True).values_list('pk', flat=True))
+    executions = WorkflowExecution.objects.bulk_create([
+        WorkflowExecution(
+            workflow_id=pk,
+            trigger_data={key: value for key, value in event.items() if key != 'workflows'},
+        )
+        for event in events for pk in event['workflows'] if pk in active
+    ])
+    from .tasks import execute_workflow
+    for execution in executions:
+        execute_workflow.delay(execution.pk)
+    return executions
+
+def run_execution(execution):
+    """
+    Run the workflow's active steps as a graph of their dependencies and
+    record the outcome. ``result_data`` has every step's status, start
+    offset and duration in milliseconds; ``critical_path_ms`` is the
+    longest chain of dependent steps, the least time the run could take.
+    """
+    started = timezone.now()
+    execution.status = 'running'
+    execution.started_at = started
+    execution.save(update_fields=['status', 'started_at'])
+
+    trigger = execution.trigger_data
+    workflow = execution.workflow
+    context = {'workflow': workflow, 'event': trigger.get('event'), 'object': load_object(trigger)}
+    steps = list(workflow.steps.filter(is_active=True).prefetch_related('depends_on'))
+    graph = step_graph(steps)
+    clock = time.perf_counter()
+    if context['object'] is None:
+        error = f"{trigger.get('model')} {trigger.get('object_id')} no longer exists"
+        results = {step.pk: {**step_entry(step), 'status': 'failed', 'error': error} for step in steps}
+    else:
+        results = run_steps(steps, graph, context)
+    duration = round((time.perf_counter() - clock) * 1000, 2)
+
+    path_ms, path = critical_path(graph, results)
+    entries = [results[step.pk] for step in steps]
+    errors = [entry['error'] for entry in entries if entry['status'] == 'failed']
+    execution.result_data = {
+        'steps': entries,
+        'duration_ms': duration,
+        'critical_path': path,
+        'queued_ms': queued_ms(trigger, started),
+    }
+    if errors:
+        execution.result_data['error'] = errors[0]
+    execution.status = 'failed' if errors else 'completed'
+    execution.critical_path_ms = path_ms
+    execution.completed_at = timezone.now()
+    execution.save(update_fields=['status', 'result_data', 'critical_path_ms', 'completed_at'])
+    return execution
+
+def step_graph(steps):
+    """
+    ``{step id: ids of the steps it waits for}``. Dependencies on inactive
+    steps are ignored. A workflow that declares no dependencies keeps the
+    strict order it always had: each step waits for the one before it.
+    """
+    active = {step.pk for step in steps}
+    graph = {step.pk: {dependency.pk for dependency in step.depends_on.all()} & active for step in steps}
+    if not any(step.depends_on.all() for step in steps):
+        for previous, step in zip(steps, steps[1:]):
+            graph[step.pk] = {previous.pk}
+    return graph
+
+def run_steps(steps, graph, context):
+    """
+    Run steps on a pool of ``WORKFLOW_STEP_WORKERS`` threads, each step as
+    soon as everything it depends on has completed. A failed step skips
+    everything downstream of it; independent branches carry on. Steps left
+    waiting at the end are on a dependency cycle. Returns ``{step id: entry}``.
+    """
+    by_id = {step.pk: step for step in steps}
+    waiting = {pk: set(dependencies) for pk, dependencies in graph.items()}
+    dependents = defaultdict(set)
+    for pk, dependencies in graph.items():
+        for dependency in dependencies:
+            dependents[dependency].add(pk)
+    results = {}
+    # Each pool thread keeps one connection for the whole run; closed below
+    pool_connections = {}
+    clock = time.perf_counter()
+
+    def take_ready():
+        ready = sorted((by_id[pk] for pk, pending in waiting.items() if not pending), key=lambda step: (step.order, step.pk))
+        for step in ready:
+            del waiting[step.pk]
+        return ready
+
+    def skip_after(pk):
+        for dependent in sorted(dependents[pk]):
+            if dependent in waiting:
+                del waiting[dependent]
+                results[dependent] = {**step_entry(by_id[dependent]), 'status': 'skipped'}
+                skip_after(dependent)
+
+    try:
+        with ThreadPoolExecutor(max_workers=settings.WORKFLOW_STEP_WORKERS) as pool:
+            running = set()
+            ready = take_ready()
+            while ready or running:
+                for group in group_steps(ready):
+                    running.add(pool.submit(run_group, group, context, clock, pool_connections))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for step, entry in future.result():
+                        results[step.pk] = entry
+                        if entry['status'] == 'completed':
+                            for dependent in dependents[step.pk]:
+                                if dependent in waiting:
+                                    waiting[dependent].discard(step.pk)
+                        else:
+                            skip_after(step.pk)
+                ready = take_ready()
+    finally:
+        for db in pool_connections.values():
+            # The pool threads have exited, so closing from here is safe
+            db.close()
+            db.dec_thread_sharing()
+
+    for pk in waiting:
+        results[pk] = {**step_entry(by_id[pk]), 'status': 'failed', 'error': 'Dependency cycle'}
+    return results
+
+def step_entry(step):
+    return {'id': step.pk, 'name': step.name, 'type': step.step_type}
+
+def group_steps(steps):
+    """Batch the ready steps that have a coalesced handler; every other step runs alone."""
+    groups = defaultdict(list)
+    for step in steps:
+        groups[step.step_type if step.step_type in COALESCED_HANDLERS else step.pk].append(step)
+    return list(groups.values())
+
+def run_group(steps, context, clock, pool_connections):
+    """Run one step, or a batch of same-type steps, on a pool thread. Returns ``[(step, entry)]``."""
+    started = time.perf_counter()
+    if threading.get_ident() not in pool_connections:
+        db = connections[DEFAULT_DB_ALIAS]
+        # Lets run_steps close it once the pool has shut down
+        db.inc_thread_sharing()
+        pool_connections[threading.get_ident()] = db
+    # Groups run concurrently, so each gets its own copy of the object,
+    # read after the steps it depends on have committed
+    instance = context['object']
+    context = {**context, 'object': type(instance)._default_manager.filter(pk=instance.pk).first()}
+    # Suppression is per thread, so each pool thread sets it for itself
+    with suppress_events():
+        if context['object'] is None:
+            outcomes = [StepError(f'{instance._meta.label_lower} {instance.pk} no longer exists')] * len(steps)
+        elif len(steps) > 1:
+            outcomes = COALESCED_HANDLERS[steps[0].step_type](steps, context)
+        else:
+            outcomes = [run_step(steps[0], context)]
+    timing = {
+        'started_ms': round((started - clock) * 1000, 2),
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+    if len(steps) > 1:
+        timing['coalesced'] = len(steps)
+    pairs = []
+    for step, outcome in zip(steps, outcomes):
+        if isinstance(outcome, Exception):
+            entry = {**step_entry(step), 'status': 'failed', 'error': str(outcome)}
+        else:
+            entry = {**step_entry(step), 'status': 'completed', 'result': outcome}
+        pairs.append((step, {**entry, **timing}))
+    return pairs
+
+def run_step(step, context):
+    """The handler's output, or the exception it raised; the step's changes commit together."""
+    try:
+        with transaction.atomic():
+            return STEP_HANDLERS[step.step_type](step.parameters, context)
+    except Exception as exc:
+        logger.exception('Workflow %s step %s failed', step.workflow_id, step.pk)
+        return exc
+
+def critical_path(graph, results):
+    """
+    The longest chain of dependent steps that ran, weighted by their
+    durations: ``(milliseconds, [step ids])``.
+    """
+    finish = {}
+
+    def chain(pk):
+        if pk not in finish:
+            before = max(
+                (chain(dependency) for dependency in graph[pk] if 'duration_ms' in results[dependency]),
+                key=lambda item: item[0], default=(0.0, []),
+            )
+            finish[pk] = (before[0] + results[pk]['duration_ms'], before[1] + [pk])
+        return finish[pk]
+
+    ran = [pk for pk, entry in results.items() if 'duration_ms' in entry]
+    if not ran:
+        return None, []
+    total, path = max((chain(pk) for pk in ran), key=lambda item: item[0])
+    return round(total, 2), path
+
+def queued_ms(trigger, started):
+    try:
+        occurred = datetime.datetime.fromisoformat(trigger['occurred_at'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return round((started - occurred).total_seconds() * 1000, 2)
+
+def load_object(trigger):
+    try:
+        model = apps.get_model(trigger['model'])
+    except (KeyError, LookupError, ValueError):
+        return None
+    return model._default_manager.filter(pk=trigger.get('object_id')).first()
+
+# Parameter templates: "{object.title}", "{object.client.email}", "{workflow.name}"
+PLACEHOLDER = re.compile(r'\{([a-z][a-z0-9_]*(?:\.[a-z][a-z0-9_]*)*)\}')
+
+def resolve(path, context):
+    parts = path.split('.')
+    if parts[0] not in context or 'password' in parts:
+        raise StepError(f'Unknown placeholder {{{path}}}')
+    value = context[parts[0]]
+    for part in parts[1:]:
+        value = getattr(value, part, None)
+        if value is None:
+            return None
+    return value.pk if hasattr(value, '_meta') else value
+
+def render(value, context):
+    """Fill placeholders in a parameter; a parameter that is one placeholder keeps its type."""
+    if not isinstance(value, str):
+        return value
+    whole = PLACEHOLDER.fullmatch(value)
+    if whole:
+        return resolve(whole.group(1), context)
+    return PLACEHOLDER.sub(lambda match: '' if (found := resolve(match.group(1), context)) is None else str(found), value)
+
+def related(instance, model):
+    """``instance`` itself, or the first object of type ``model`` it points at."""
+    if isinstance(instance, model):
+        return instance
+    for field in instance._meta.concrete_fields:
+        if field.many_to_one and field.related_model is model:
+            return getattr(instance, field.name)
+    return None
+
+def assignee_field(instance):
+    for field in instance._meta.concrete_fields:
+        if field.name in ASSIGNEE_FIELDS:
+            return field
+    return None
+
+def save_fields(instance, names):
+    """Save ``names`` plus any auto_now timestamps."""
+    auto_now = [field.name for field in instance._meta.concrete_fields if getattr(field, 'auto_now', False)]
+    instance.save(update_fields=names + auto_now)
+
+def user_id(params, context, default=None):
+    value = render(params.get('user', params.get('assigned_to')), context)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise StepError(f'Expected a user id, got {value!r}')
+
+def build_task(params, context):
+    instance = context['object']
+    workflow = context['workflow']
+    field = assignee_field(instance)
+    current = getattr(instance, field.attname) if field is not None else None
+    task = Task(
+        title=render(params.get('title', '{workflow.name}'), context)[:200],
+        description=render(params.get('description', 'Created by the {workflow.name} workflow'), context),
+        priority=params.get('priority', 'medium'),
+        assigned_to_id=user_id(params, context, default=current or workflow.created_by_id),
+        case=related(instance, Case),
+        contact=related(instance, Contact),
+        created_by_id=workflow.created_by_id,
+    )
+    if params.get('due_in_days') is not None:
+        task.due_date = timezone.now() + datetime.timedelta(days=float(params['due_in_days']))
+    task.full_clean()
+    return task
+
+def create_task(params, context):
+    task = build_task(params, context)
+    task.save()
+    return {'task_id': task.pk}
+
+def create_tasks(steps, context):
+    """
+    Several ready ``create_task`` steps as one INSERT. Each task is validated
+    on its own, so one bad step doesn't fail the others.
+    """
+    outcomes = []
+    for step in steps:
+        try:
+            outcomes.append(build_task(step.parameters, context))
+        except Exception as exc:
+            logger.exception('Workflow %s step %s failed', step.workflow_id, step.pk)
+            outcomes.append(exc)
+    tasks = [outcome for outcome in outcomes if isinstance(outcome, Task)]
+    try:
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            bulk_saved.send(sender=Task, instances=tasks, created=True)
+    except Exception as exc:
+        logger.exception('Workflow %s task batch failed', steps[0].workflow_id)
+        return [exc if isinstance(outcome, Task) else outcome for outcome in outcomes]
+    return [{'task_id': outcome.pk} if isinstance(outcome, Task) else outcome for outcome in outcomes]
+
+def send_email(params, context):
+    from emails.delivery import claim, queue, send_now, sending_problems
+    from emails.models import Email
+    from emails.tasks import drain_outbox
+    instance = context['object']
+    contact = related(instance, Contact)
+    email = Email(
+        subject=render(params.get('subject', '{workflow.name}'), context)[:200],
+        body=render(params.get('body', ''), context),
+        from_email=params.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+        to_emails=render(params['to'], context) if params.get('to') else (contact.email if contact else ''),
+        case=related(instance, Case),
+        contact=contact,
+    )
+    # Saved as a draft first so the checks can see its attachments; the
+    # step's transaction discards it if it can't be sent
+    email.save()
+    problems = sending_problems(email)
+    if problems:
+        raise StepError('; '.join(problems))
+    user = context['workflow'].created_by
+    if settings.EMAIL_OUTBOX_ENABLED:
+        queue(email, user)
+        email.save()
+        transaction.on_commit(drain_outbox.delay)
+    else:
+        # Sent once the step commits, so a rolled-back step never leaves a
+        # delivered email behind; the outcome is saved on the email itself
+        claim([email], user)
+        transaction.on_commit(lambda: send_now(email))
+    return {'email_id': email.pk}
+
+def update_status(params, context):
+    instance = context['object']
+    if not has_status(type(instance)):
+        raise StepError(f'{instance._meta.verbose_name.capitalize()} has no status')
+    previous = instance.status
+    instance.status = instance._meta.get_field('status').clean(render(params.get('status'), context), instance)
+    save_fields(instance, ['status'])
+    return {'status': [previous, instance.status]}
+
+def assign_user(params, context):
+    instance = context['object']
+    field = assignee_field(instance)
+    if field is None:
+        raise StepError(f'{instance._meta.verbose_name.capitalize()} has no assignee')
+    pk = user_id(params, context)
+    if pk is None:
+        raise StepError('assign_user needs a user')
+    if not field.related_model._default_manager.filter(pk=pk).exists():
+        raise StepError(f'User {pk} does not exist')
+    previous = getattr(instance, field.attname)
+    setattr(instance, field.attname, pk)
+    save_fields(instance, [field.name])
+    return {field.name: [previous, pk]}
+
+def create_document(params, context):
+    instance = context['object']
+    workflow = context['workflow']
+    title = render(params.get('title', '{workflow.name}'), context)[:200]
+    document = Document(
+        title=title,
+        description=render(params.get('description', ''), context),
+        document_type=params.get('document_type', 'other'),
+        case=related(instance, Case),
+        contact=related(instance, Contact),
+        uploaded_by_id=workflow.created_by_id,
+    )
+    if params.get('template'):
+        # Share the template's stored file rather than copying its bytes
+        template = Document.objects.filter(pk=params['template']).only('file').first()
+        if template is None:
+            raise StepError(f"Template document {params['template']} does not exist")
+        document.file = template.file.name
+    else:
+        content = render(params.get('content', ''), context)
+        document.file.save(f"{slugify(title) or 'document'}.txt", ContentFile(content.encode('utf-8')), save=False)
+    document.full_clean(exclude=['file'])
+    document.save()
+    return {'document_id': document.pk}
+
+STEP_HANDLERS = {
+    'create_task': create_task,
+    'send_email': send_email,
+    'update_status': update_status,
+    'assign_user': assign_user,
+    'create_document': create_document,
+}
+# Handlers that run several ready steps of their type in one batch
+COALESCED_HANDLERS = {
+    'create_task': create_tasks,
+}
+
+def remember_status(sender, instance, raw=False, **kwargs):
+    # Only pay for the lookup when a workflow listens for status changes
+    instance._workflow_status = None
+    if raw or instance._state.adding or getattr(_state, 'suppressed', 0) or not has_status(sender):
+        return
+    if index.get(f'{EVENT_SOURCES[sender]}.status_changed'):
+        instance._workflow_status = sender._base_manager.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+def model_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    prefix = EVENT_SOURCES[sender]
+    emit(f'{prefix}.created' if created else f'{prefix}.updated', sender, instance.pk)
+    previous = getattr(instance, '_workflow_status', None)
+    if not created and previous is not None and previous != instance.status:
+        emit(f'{prefix}.status_changed', sender, instance.pk, **{'from': previous, 'to': instance.status})
+
+def models_bulk_saved(sender, instances, created=False, previous=None, **kwargs):
+    prefix = EVENT_SOURCES[sender]
+    for instance in instances:
+        emit(f'{prefix}.created' if created else f'{prefix}.updated', sender, instance.pk)
+        before = (previous or {}).get(instance.pk, {}).get('status')
+        if not created and before is not None and before != instance.status:
+            emit(f'{prefix}.status_changed', sender, instance.pk, **{'from': before, 'to': instance.status})
+
+def workflows_changed(sender, **kwargs):
+    transaction.on_commit(index.invalidate)
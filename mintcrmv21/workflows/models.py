@@ -28,6 +28,8 @@ class WorkflowStep(models.Model):
     order = models.IntegerField()
     parameters = models.JSONField(default=dict)
     is_active = models.BooleanField(default=True)
+    # Steps that must finish first; a workflow that declares none runs its steps in order
+    depends_on = models.ManyToManyField('self', symmetrical=False, blank=True, related_name='dependents')
     
     class Meta:
         ordering = ['order']
@@ -49,6 +51,7 @@ class WorkflowExecution(models.Model):
     result_data = models.JSONField(default=dict)
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    critical_path_ms = models.FloatField(null=True, blank=True, help_text="Longest chain of dependent step durations")
     
     def __str__(self):
         return f"{self.workflow.name} - {self.status}"
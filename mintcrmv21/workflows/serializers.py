@@ -1,20 +1,28 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
+from .engine import EVENTS
 from .models import Workflow, WorkflowStep, WorkflowExecution
 from accounts.serializers import UserSerializer
 
-class WorkflowStepSerializer(serializers.ModelSerializer):
+class WorkflowStepSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = WorkflowStep
-        fields = ['id', 'name', 'step_type', 'order', 'parameters', 'is_active']
+        fields = ['id', 'name', 'step_type', 'order', 'parameters', 'is_active', 'depends_on']
         read_only_fields = ['id']
+    
+    def validate_depends_on(self, value):
+        workflow_id = self.instance.workflow_id if self.instance else int(self.context['view'].kwargs['workflow_id'])
+        if any(step.workflow_id != workflow_id for step in value):
+            raise serializers.ValidationError('Steps can only depend on steps of the same workflow.')
+        return value
 
-class WorkflowExecutionSerializer(serializers.ModelSerializer):
+class WorkflowExecutionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = WorkflowExecution
-        fields = ['id', 'status', 'trigger_data', 'result_data', 'started_at', 'completed_at']
-        read_only_fields = ['id', 'started_at', 'completed_at']
+        fields = ['id', 'status', 'trigger_data', 'result_data', 'started_at', 'completed_at', 'critical_path_ms']
+        read_only_fields = ['id', 'started_at', 'completed_at', 'critical_path_ms']
 
-class WorkflowSerializer(serializers.ModelSerializer):
+class WorkflowSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     steps = WorkflowStepSerializer(many=True, read_only=True)
     executions = WorkflowExecutionSerializer(many=True, read_only=True)
@@ -26,3 +34,8 @@ class WorkflowSerializer(serializers.ModelSerializer):
             'created_by', 'created_at', 'updated_at', 'steps', 'executions'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate_trigger_event(self, value):
+        if value not in EVENTS:
+            raise serializers.ValidationError(f"Unknown event. Choose one of: {', '.join(EVENTS)}")
+        return value
@@ -0,0 +1,15 @@
+from celery import shared_task
+from .engine import run_execution, start_executions
+from .models import WorkflowExecution
+
+@shared_task
+def run_workflows(events):
+    return len(start_executions(events))
+
+@shared_task
+def execute_workflow(execution_id):
+    execution = WorkflowExecution.objects.select_related('workflow__created_by').get(pk=execution_id)
+    if execution.status != 'pending':
+        # Redelivered task; the execution already ran or is running
+        return execution.status
+    return run_execution(execution).status
@@ -2,10 +2,11 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from core.mixins import QueryPlanMixin
 from .models import Workflow, WorkflowStep, WorkflowExecution
 from .serializers import WorkflowSerializer, WorkflowStepSerializer, WorkflowExecutionSerializer
 
-class WorkflowListCreateView(generics.ListCreateAPIView):
+class WorkflowListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     queryset = Workflow.objects.all()
     serializer_class = WorkflowSerializer
     permission_classes = [IsAuthenticated]
@@ -17,12 +18,12 @@ class WorkflowListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class WorkflowDetailView(generics.RetrieveUpdateDestroyAPIView):
+class WorkflowDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Workflow.objects.all()
     serializer_class = WorkflowSerializer
     permission_classes = [IsAuthenticated]
 
-class WorkflowStepListCreateView(generics.ListCreateAPIView):
+class WorkflowStepListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     serializer_class = WorkflowStepSerializer
     permission_classes = [IsAuthenticated]
     
@@ -34,7 +35,7 @@ class WorkflowStepListCreateView(generics.ListCreateAPIView):
         workflow_id = self.kwargs['workflow_id']
         serializer.save(workflow_id=workflow_id)
 
-class WorkflowExecutionListView(generics.ListAPIView):
+class WorkflowExecutionListView(QueryPlanMixin, generics.ListAPIView):
     serializer_class = WorkflowExecutionSerializer
     permission_classes = [IsAuthenticated]
     